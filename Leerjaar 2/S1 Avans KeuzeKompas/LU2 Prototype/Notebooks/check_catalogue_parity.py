@@ -0,0 +1,175 @@
+import argparse
+import ast
+import contextlib
+import importlib
+import io
+import json
+import random
+import sys
+
+import pandas as pd
+
+from helpers.functs.catalogue import load_catalogue
+
+# Checks that the notebooks give the same results with the typed frames of helpers/functs/catalogue.py
+# as with the plain pd.read_csv frames they used before. Run from the Notebooks folder:
+#   python check_catalogue_parity.py
+# The frame checks only need pandas. The pipeline checks run the notebooks' run_evaluation_multi with
+# both frames and need the full notebook environment (NLTK corpora, sentence-transformers); a
+# pipeline that cannot be imported is reported as skipped.
+
+CSV_PATHS = {
+    "hard-NLP": "../Data/Cleaned/cleaned_dataset_hard-NLP.csv",
+    "soft-NLP": "../Data/Cleaned/cleaned_dataset_soft-NLP.csv",
+    "raw": "../Data/Raw/Uitgebreide_VKM_dataset.csv",
+}
+
+PIPELINES = {
+    "not_tuned_bow_model": "hard-NLP",
+    "yes_tuned_bow_model": "hard-NLP",
+    "not_tuned_se_model": "soft-NLP",
+    "yes_tuned_se_model": "soft-NLP",
+}
+
+# Notebook cells that define `students` and `matching_models_list`
+STUDENT_CELLS = [("7_evaluation_se.ipynb", 2), ("10_demo_cgi.ipynb", 2)]
+
+TEXT_COLUMNS = ["name", "description", "learningoutcomes", "module_tags"]
+
+
+def legacy_normalize_locations(series: pd.Series) -> pd.Series:
+    # The pipelines' location parsing before the shared loader (ast.literal_eval per row)
+    def _to_list(val):
+        try:
+            parsed = ast.literal_eval(str(val))
+            if isinstance(parsed, list):
+                return [str(x).strip().lower() for x in parsed]
+            return [str(parsed).strip().lower()]
+        except Exception:
+            return [str(val).strip().lower()]
+
+    return series.apply(_to_list)
+
+
+def normalize_locations(series: pd.Series) -> pd.Series:
+    return series.apply(lambda locations: [str(x).strip().lower() for x in locations])
+
+
+def notebook_students():
+    # Executes the student cells without their pipeline imports, so no model is loaded here
+    students, matching = [], []
+    for path, cell in STUDENT_CELLS:
+        with open(path, encoding="utf-8") as f:
+            source = "".join(json.load(f)["cells"][cell]["source"])
+        lines = [line for line in source.splitlines()
+                 if not line.startswith(("from helpers.notebook_pipelines", "from IPython"))]
+        namespace = {}
+        exec("\n".join(lines), namespace)
+        students += namespace["students"]
+        matching += namespace["matching_models_list"]
+    return students, matching
+
+
+def filtered_ids(df: pd.DataFrame, normalize, student) -> list:
+    # The hard-filter block the four pipelines share
+    filtered_df = df.copy()
+    min_cred, max_cred = student.wanted_study_credit_range
+    filtered_df = filtered_df[(filtered_df["studycredit"] >= min_cred) & (filtered_df["studycredit"] <= max_cred)]
+    if student.location_preference:
+        locations = normalize(filtered_df["location"])
+        wanted = [str(x).strip().lower() for x in student.location_preference]
+        filtered_df = filtered_df[locations.apply(lambda lst: any(x in wanted for x in lst))]
+    if student.level_preference:
+        levels = [str(x).strip().lower() for x in student.level_preference]
+        filtered_df = filtered_df[filtered_df["level"].astype(str).str.lower().isin(levels)]
+    filtered_df = filtered_df[filtered_df["available_spots"] > 0]
+    return filtered_df["id"].tolist()
+
+
+def module_texts(df: pd.DataFrame) -> list:
+    # What the cells read as text: the BOW base text and the SE motivation's module text
+    columns = [col for col in TEXT_COLUMNS if col in df.columns]
+    return [tuple(str(value) for value in row) for row in df[["id"] + columns].fillna("").itertuples(index=False)]
+
+
+def frame_checks(legacy: dict, typed: dict, students) -> list[str]:
+    problems = []
+    for name in legacy:
+        if legacy[name]["id"].tolist() != typed[name]["id"].tolist():
+            problems.append(f"{name}: module ids or their order differ")
+        if module_texts(legacy[name]) != module_texts(typed[name]):
+            problems.append(f"{name}: module texts differ")
+        if name == "raw":
+            continue
+        for i, student in enumerate(students, start=1):
+            before = filtered_ids(legacy[name], legacy_normalize_locations, student)
+            after = filtered_ids(typed[name], normalize_locations, student)
+            if before != after:
+                problems.append(f"{name}: filtered modules of student {i} differ ({len(before)} vs {len(after)})")
+    return problems
+
+
+def run_pipeline(module, df, raw_df, normalize, students, matching):
+    module.df, module.raw_df, module._normalize_locations = df, raw_df, normalize
+    random.seed(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results, precision = module.run_evaluation_multi(students, matching, top_n=5, k=5)
+    return [result["recs"] for result in results], precision
+
+
+def pipeline_checks(legacy: dict, typed: dict, students, matching) -> tuple[list[str], list[str]]:
+    problems, skipped = [], []
+    for name, source in PIPELINES.items():
+        try:
+            module = importlib.import_module(f"helpers.notebook_pipelines.{name}")
+        except Exception as e:
+            skipped.append(f"{name}: {type(e).__name__}: {e}")
+            continue
+        normalize = module._normalize_locations
+        try:
+            before = run_pipeline(module, legacy[source], legacy["raw"], legacy_normalize_locations, students, matching)
+            after = run_pipeline(module, typed[source], typed["raw"], normalize, students, matching)
+        except LookupError as e:
+            # NLTK corpus missing
+            hint = next((line.strip() for line in str(e).splitlines() if line.strip().strip("*")), "")
+            skipped.append(f"{name}: {type(e).__name__}: {hint}")
+            continue
+        finally:
+            module.df, module.raw_df, module._normalize_locations = typed[source], typed["raw"], normalize
+        if before[1] != after[1]:
+            problems.append(f"{name}: precision@5 {before[1]:.3f} vs {after[1]:.3f}")
+        for i, (recs_before, recs_after) in enumerate(zip(before[0], after[0]), start=1):
+            try:
+                pd.testing.assert_frame_equal(recs_before, recs_after, check_dtype=False)
+            except AssertionError as e:
+                problems.append(f"{name}: recommendations of student {i} differ: {str(e).splitlines()[0]}")
+    return problems, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare notebook results on pd.read_csv vs load_catalogue frames")
+    parser.add_argument("--frames-only", action="store_true", help="skip running the notebook pipelines")
+    args = parser.parse_args()
+
+    legacy = {name: pd.read_csv(path) for name, path in CSV_PATHS.items()}
+    typed = {name: load_catalogue(path) for name, path in CSV_PATHS.items()}
+    students, matching = notebook_students()
+
+    problems = frame_checks(legacy, typed, students)
+    skipped = []
+    if not args.frames_only:
+        pipeline_problems, skipped = pipeline_checks(legacy, typed, students, matching)
+        problems += pipeline_problems
+
+    print(f"{len(students)} notebook students, {len(CSV_PATHS)} catalogues")
+    for line in skipped:
+        print(f"skipped {line}")
+    for line in problems:
+        print(f"DIFF {line}")
+    if not problems:
+        print("frames" + ("" if args.frames_only else " and pipelines that ran") + ": same results")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import os
+import sys
+
+# The catalogue loader lives in the recommender service (LU3 Minimum Viable Product/AI/services/catalogue.py).
+# The service root is put on sys.path and the loader re-exported here, so the notebooks and the
+# service parse the CSVs with one and the same module instead of two copies.
+SERVICE_ROOT = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "LU3 Minimum Viable Product", "AI",
+))
+if SERVICE_ROOT not in sys.path:
+    sys.path.append(SERVICE_ROOT)
+
+from services.catalogue import (  # noqa: E402
+    MONTH_PERIODS,
+    NUMERIC_COLUMNS,
+    catalogue_digest,
+    file_sha256,
+    load_catalogue,
+    parse_catalogue,
+    parse_locations,
+)
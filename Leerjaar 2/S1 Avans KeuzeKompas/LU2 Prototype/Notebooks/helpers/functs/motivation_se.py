@@ -6,6 +6,8 @@ import numpy as np
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from helpers.functs.topk import top_k_indices
+
 
 def strength_phrase_se(score: float, is_dutch: bool = True) -> str:
     # Map the similarity score to a short strength phrase
@@ -107,11 +109,10 @@ def _best_profile_snippets_for_module(
 
     sims = cosine_similarity(module_embedding, np.vstack(snippet_embeddings))[0]
 
-    order = np.argsort(-sims)
     # Take only the best snippet with similarity > 0 for readability. Otherwise too cluttered
-    for idx in order:
-        if sims[idx] > 0:
-            return [snippets[idx]]
+    best = top_k_indices(sims, 1)[0]
+    if sims[best] > 0:
+        return [snippets[best]]
     return []
 
 
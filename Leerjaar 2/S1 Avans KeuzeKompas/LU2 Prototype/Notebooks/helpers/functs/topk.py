@@ -0,0 +1,4 @@
+# Same top-k as the recommender service (services/topk.py), so the notebooks rank exactly like the
+# API. Importing helpers.functs.catalogue puts the service root on sys.path
+import helpers.functs.catalogue  # noqa: F401
+from services.topk import top_k_indices  # noqa: E402,F401
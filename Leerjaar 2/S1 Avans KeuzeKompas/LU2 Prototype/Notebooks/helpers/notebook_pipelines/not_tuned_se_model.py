@@ -1,31 +1,25 @@
 from helpers.functs.StudentProfile import StudentProfile
+from helpers.functs.catalogue import load_catalogue
+from helpers.functs.topk import top_k_indices
 from helpers.functs.motivation_se import add_motivation_column_se
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 from helpers.functs.NLP import soft_nlp
 import pandas as pd
 import numpy as np
-import ast
+import os
 from typing import Iterable, List, Tuple
 
 # Load soft-NLP module data, raw data for names, and precomputed embeddings
-df = pd.read_csv("../Data/Cleaned/cleaned_dataset_soft-NLP.csv")
-raw_df = pd.read_csv("../Data/Raw/Uitgebreide_VKM_dataset.csv")
-embedded_modules = pd.read_csv("../Data/Processed/sentence_embedded_dataframe.csv")
+df = load_catalogue("../Data/Cleaned/cleaned_dataset_soft-NLP.csv")
+raw_df = load_catalogue("../Data/Raw/Uitgebreide_VKM_dataset.csv")
+EMBEDDINGS_NPY = "../Data/Processed/module_embeddings.npy"
+EMBEDDINGS_CSV = "../Data/Processed/sentence_embedded_dataframe.csv"
 
 
 def _normalize_locations(series: pd.Series) -> pd.Series:
-    # Turn stored location strings into cleaned lists of locations
-    def _to_list(val):
-        try:
-            parsed = ast.literal_eval(str(val))
-            if isinstance(parsed, list):
-                return [str(x).strip().lower() for x in parsed]
-            return [str(parsed).strip().lower()]
-        except Exception:
-            return [str(val).strip().lower()]
-
-    return series.apply(_to_list)
+    # Locations are already lists (helpers/functs/catalogue.py); only lower case them for matching
+    return series.apply(lambda locations: [str(x).strip().lower() for x in locations])
 
 
 def _build_filtered_df(student: StudentProfile) -> pd.DataFrame:
@@ -56,21 +50,27 @@ def _build_filtered_df(student: StudentProfile) -> pd.DataFrame:
     return filtered_df
 
 
-def _prepare_embedded_modules() -> pd.DataFrame:
-    # Parse stored embedding strings back into NumPy vectors
-    em = embedded_modules.copy()
+def _prepare_embedded_modules() -> Tuple[pd.DataFrame, np.ndarray]:
+    # Open the binary store memory-mapped (no parsing, no copy); fall back to parsing the CSV
+    if os.path.exists(EMBEDDINGS_NPY):
+        ids = np.load(EMBEDDINGS_NPY[:-len(".npy")] + ".ids.npy")
+        module_matrix = np.load(EMBEDDINGS_NPY, mmap_mode="r")
+        return pd.DataFrame({"id": ids}), module_matrix
+
+    em = pd.read_csv(EMBEDDINGS_CSV)
     if "sentence_embedding_vector" not in em.columns:
         raise KeyError("embedded_modules must contain 'sentence_embedding_vector' column.")
     if "id" not in em.columns:
         raise KeyError("embedded_modules must contain 'id' column.")
 
-    em["sentence_embedding_vector"] = em["sentence_embedding_vector"].apply(
+    # Parse stored embedding strings back into NumPy vectors
+    vectors = em["sentence_embedding_vector"].apply(
         lambda x: np.fromstring(x.strip("[]"), sep=" ") if isinstance(x, str) else np.array(x)
     )
-    return em
+    return em[["id"]], np.stack(vectors.values)
 
 
-_EMBEDDED_MODULES_PREPARED = _prepare_embedded_modules()
+_EMBEDDED_MODULES_PREPARED, _EMBEDDED_MODULE_MATRIX = _prepare_embedded_modules()
 
 
 def _recommend_for_student(
@@ -93,7 +93,7 @@ def _recommend_for_student(
         embedded_student_input = embedded_student_input.reshape(1, -1)
 
     # Build a matrix with all module embeddings
-    module_matrix = np.stack(_EMBEDDED_MODULES_PREPARED["sentence_embedding_vector"].values)
+    module_matrix = _EMBEDDED_MODULE_MATRIX
 
     # Compute cosine similarity between student and each module
     scores_global = cosine_similarity(embedded_student_input, module_matrix)[0]
@@ -109,7 +109,7 @@ def _recommend_for_student(
         raise ValueError("No modules remain after filtering; cannot compute recommendations.")
 
     # Sort candidate modules by similarity and take the top-N
-    order = np.argsort(-scores_candidates)[:top_n]
+    order = top_k_indices(scores_candidates, top_n)
     top_idx = idx_candidates[order]
 
     module_ids = _EMBEDDED_MODULES_PREPARED.iloc[top_idx]["id"].values
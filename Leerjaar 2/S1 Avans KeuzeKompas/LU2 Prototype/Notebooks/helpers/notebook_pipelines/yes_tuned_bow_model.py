@@ -1,29 +1,21 @@
 from helpers.functs.nlp_backmap import build_token_backmap, make_pretty_term
 from sklearn.feature_extraction.text import TfidfVectorizer
 from helpers.functs.StudentProfile import StudentProfile
+from helpers.functs.catalogue import load_catalogue
+from helpers.functs.topk import top_k_indices
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.decomposition import TruncatedSVD
 from helpers.functs.NLP import hard_nlp
 import pandas as pd
 import numpy as np
-import ast
 import random
 
-df = pd.read_csv("../Data/Cleaned/cleaned_dataset_hard-NLP.csv")
-raw_df = pd.read_csv("../Data/Raw/Uitgebreide_VKM_dataset.csv")
+df = load_catalogue("../Data/Cleaned/cleaned_dataset_hard-NLP.csv")
+raw_df = load_catalogue("../Data/Raw/Uitgebreide_VKM_dataset.csv")
 
 
 def _normalize_locations(series: pd.Series) -> pd.Series:
-    def _to_list(val):
-        try:
-            parsed = ast.literal_eval(str(val))
-            if isinstance(parsed, list):
-                return [str(x).strip().lower() for x in parsed]
-            return [str(parsed).strip().lower()]
-        except Exception:
-            return [str(val).strip().lower()]
-
-    return series.apply(_to_list)
+    return series.apply(lambda locations: [str(x).strip().lower() for x in locations])
 
 
 def _build_base_text_df():
@@ -228,7 +220,7 @@ def run_evaluation_multi(students, matching_models_list, top_n: int = 5, k: int
         if len(idx_candidates) == 0:
             raise ValueError("No modules remain after filtering; cannot compute recommendations.")
 
-        order = np.argsort(-scores_candidates)[:top_n]
+        order = top_k_indices(scores_candidates, top_n)
         top_idx = idx_candidates[order]
 
         student_vec = X_interests_tfidf.toarray().flatten()
@@ -239,7 +231,7 @@ def run_evaluation_multi(students, matching_models_list, top_n: int = 5, k: int
             if not mask.any():
                 return ""
             shared_scores = (student_vec * module_vec) * mask
-            top_idx_local = np.argsort(-shared_scores)[:top_k]
+            top_idx_local = top_k_indices(shared_scores, top_k)
 
             terms = []
             for i in top_idx_local:
@@ -0,0 +1,37 @@
+import os
+
+import pandas as pd
+import pytest
+
+from services.embedding_store import read_embeddings
+
+from benchmarks.synthetic import make_catalogue
+
+# The legacy text formats are far too slow for 100k modules; parse them up to 10k
+LEGACY_SIZES = [1000, 10000]
+
+
+@pytest.fixture(scope="module", params=LEGACY_SIZES, ids=lambda n: f"{n}_modules")
+def legacy_files(request, tmp_path_factory):
+    directory = tmp_path_factory.mktemp("legacy")
+    metadata, matrix = make_catalogue(request.param)
+    frame = pd.DataFrame({"id": metadata["id"], "sentence_embedding_vector": list(matrix)})
+    pkl_path = os.path.join(directory, "embeddings.pkl")
+    csv_path = os.path.join(directory, "embeddings.csv")
+    frame.to_pickle(pkl_path)
+    frame.to_csv(csv_path, index=False)
+    return pkl_path, csv_path
+
+
+def test_read_binary(benchmark, catalogue):
+    # Memory-mapped .npy store, the format the service uses
+    _, store = catalogue
+    benchmark(read_embeddings, store.path)
+
+
+def test_read_pickle(benchmark, legacy_files):
+    benchmark(read_embeddings, legacy_files[0])
+
+
+def test_read_csv(benchmark, legacy_files):
+    benchmark.pedantic(read_embeddings, args=(legacy_files[1],), rounds=3)
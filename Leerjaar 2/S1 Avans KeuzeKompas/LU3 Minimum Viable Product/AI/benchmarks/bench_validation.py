@@ -0,0 +1,22 @@
+import pytest
+
+from models.student_input import StudentInput, StudentInputColumns, validate_columns
+
+from benchmarks.synthetic import make_students
+
+ROWS = [1000, 10000]
+
+
+@pytest.fixture(scope="module", params=ROWS, ids=lambda n: f"{n}_students")
+def records(request):
+    return [student.model_dump() for student in make_students(request.param)]
+
+
+def test_validate_objects(benchmark, records):
+    # One StudentInput per row: every field validator runs once per object
+    benchmark(lambda: [StudentInput(**record) for record in records])
+
+
+def test_validate_columns(benchmark, records):
+    columns = StudentInputColumns.from_records(records)
+    benchmark(validate_columns, columns)
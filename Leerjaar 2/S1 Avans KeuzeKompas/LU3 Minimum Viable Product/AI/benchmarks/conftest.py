@@ -0,0 +1,40 @@
+import os
+import sys
+
+# Benchmarks always run against the deterministic stub encoder: offline and reproducible.
+# Set before config is imported anywhere
+os.environ.setdefault("KEUZEKOMPAS_ENCODER_BACKEND", "stub")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+
+from services import predict_service
+from services.embedding_store import EmbeddingStore
+
+from benchmarks.synthetic import make_students, write_catalogue
+
+# Catalogue sizes, override with e.g. BENCH_SIZES=1000,10000
+SIZES = [int(n) for n in os.environ.get("BENCH_SIZES", "1000,10000,100000").split(",")]
+
+
+@pytest.fixture(scope="session")
+def catalogue_dir(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("catalogues"))
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"{n}_modules")
+def catalogue(request, catalogue_dir, monkeypatch):
+    # Points the predict service at a synthetic catalogue of the given size
+    metadata_path, embeddings_path = write_catalogue(catalogue_dir, request.param)
+    store = EmbeddingStore(embeddings_path)
+    store.load()
+    monkeypatch.setattr(predict_service, "embedding_store", store)
+    return metadata_path, store
+
+
+@pytest.fixture(scope="session")
+def students():
+    return make_students(32)
@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import httpx
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "scripts", "fixtures", "student_inputs.json")
+
+
+def spawn_server(url: str, real_encoder: bool, timeout: float) -> subprocess.Popen:
+    # Starts boot.py (port 8000) and waits until /ready reports the warm-up is done
+    env = dict(os.environ)
+    if not real_encoder:
+        env.setdefault("KEUZEKOMPAS_ENCODER_BACKEND", "stub")
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "boot.py")], cwd=ROOT, env=env)
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"boot.py exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{url}/ready", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"{url}/ready did not report ready within {timeout}s")
+
+
+async def run_level(url: str, endpoint: str, payloads: list, concurrency: int, n_requests: int, unique: bool) -> dict:
+    latencies = []
+    statuses = Counter()
+    issued = 0
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal issued
+        while issued < n_requests:
+            i = issued
+            issued += 1
+            payload = payloads[i % len(payloads)]
+            if unique:
+                # A fresh interest per request defeats the embedding and response caches, so every request hits the encoder
+                payload = {**payload, "interests": payload["interests"] + [f"onderwerp {i}"]}
+            started = time.perf_counter()
+            try:
+                response = await client.post(endpoint, json=payload)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+    }
+
+
+# HTTP load generator for the recommender API. Reports latency percentiles and throughput per
+# concurrency level. With --spawn it starts boot.py itself, on the stub encoder unless --real-encoder.
+def main():
+    parser = argparse.ArgumentParser(description="Load test the KeuzeKompas recommender API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", default="/predict/")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=500, help="requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed requests before the first level")
+    parser.add_argument("--fixtures", default=FIXTURES, help="JSON list of StudentInput payloads")
+    parser.add_argument("--unique", action="store_true", help="make every payload unique (no cache hits)")
+    parser.add_argument("--spawn", action="store_true", help="start boot.py and wait for /ready")
+    parser.add_argument("--real-encoder", action="store_true", help="with --spawn: use the configured encoder, not the stub")
+    parser.add_argument("--ready-timeout", type=float, default=300)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    with open(args.fixtures, encoding="utf-8") as f:
+        payloads = json.load(f)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    server = spawn_server(args.url, args.real_encoder, args.ready_timeout) if args.spawn else None
+    try:
+        asyncio.run(run_level(args.url, args.endpoint, payloads, 1, args.warmup, unique=False))
+        results = []
+        print(f"{'conc':>5} {'reqs':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+        for concurrency in levels:
+            result = asyncio.run(run_level(args.url, args.endpoint, payloads, concurrency, args.requests, args.unique))
+            results.append(result)
+            print(f"{concurrency:>5} {result['requests']:>6} {result['rps']:>8} {result['p50_ms']:>9} "
+                  f"{result['p95_ms']:>9} {result['p99_ms']:>9}  {result['statuses']}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"url": args.url, "endpoint": args.endpoint, "unique": args.unique, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
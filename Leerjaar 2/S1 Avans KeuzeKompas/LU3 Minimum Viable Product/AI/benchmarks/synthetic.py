@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from services.embedding_store import write_binary_embeddings
+from services.filter_index import PERIODS
+from models.student_input import ALLOWED_LOCATIONS, StudentInput
+
+WORDS = (
+    "data analyse zorg techniek ontwerp onderzoek communicatie marketing software duurzaam energie "
+    "psychologie onderwijs logistiek ethiek security game media recht financien biologie kunst sport "
+    "management innovatie programmeren netwerken robotica gezondheid cultuur internationaal"
+).split()
+LOCATIONS = sorted(ALLOWED_LOCATIONS)
+START_DATES = {"P1": "2025-09-01", "P2": "2025-12-01", "P3": "2026-03-01", "P4": "2026-06-01"}
+
+
+def _sentence(rng: np.random.Generator, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS, size=n_words))
+
+
+def make_catalogue(n_modules: int, dimension: int = 384, seed: int = 0) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Synthetic VKM catalogue with the columns the filters and motivations use, plus a random
+    (unit) embedding per module. Same seed, same catalogue.
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, n_modules + 1, dtype=np.int64)
+    locations = [
+        str(sorted(set(rng.choice(LOCATIONS, size=rng.integers(1, 3)).tolist()))) for _ in range(n_modules)
+    ]
+    metadata = pd.DataFrame({
+        "id": ids,
+        "name": [_sentence(rng, 3) for _ in range(n_modules)],
+        "description": [_sentence(rng, 40) for _ in range(n_modules)],
+        "studycredit": rng.choice([15, 30], size=n_modules),
+        "location": locations,
+        "level": rng.choice(["NLQF5", "NLQF6"], size=n_modules),
+        "learningoutcomes": [_sentence(rng, 20) for _ in range(n_modules)],
+        "start_date": [START_DATES[p] for p in rng.choice(PERIODS, size=n_modules)],
+    })
+    matrix = rng.standard_normal((n_modules, dimension), dtype=np.float32)
+    return metadata, matrix
+
+
+def write_catalogue(directory: str, n_modules: int, seed: int = 0) -> tuple[str, str]:
+    # Returns (metadata csv, embeddings npy); files are reused when they already exist
+    metadata_path = os.path.join(directory, f"catalogue_{n_modules}.csv")
+    embeddings_path = os.path.join(directory, f"catalogue_{n_modules}.npy")
+    if not (os.path.exists(metadata_path) and os.path.exists(embeddings_path)):
+        metadata, matrix = make_catalogue(n_modules, seed=seed)
+        metadata.to_csv(metadata_path, index=False)
+        write_binary_embeddings(embeddings_path, metadata["id"].to_numpy(), matrix)
+    return metadata_path, embeddings_path
+
+
+def make_students(n_students: int, seed: int = 1) -> list[StudentInput]:
+    rng = np.random.default_rng(seed)
+    return [
+        StudentInput(
+            current_study=_sentence(rng, 2),
+            interests=[_sentence(rng, 3) for _ in range(3)],
+            wanted_study_credit_range=(0, 30),
+            location_preference=sorted(set(rng.choice(LOCATIONS, size=2).tolist())),
+            learning_goals=[_sentence(rng, 4) for _ in range(2)],
+            level_preference=["NLQF5", "NLQF6"],
+            preferred_language="Niet van toepassing",
+            preferred_period=sorted(set(rng.choice(PERIODS, size=3).tolist())),
+        )
+        for _ in range(n_students)
+    ]
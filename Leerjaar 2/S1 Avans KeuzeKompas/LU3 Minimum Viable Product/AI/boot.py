@@ -8,8 +8,19 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 from main import app
+from config import settings
+
+HOST = "0.0.0.0"
+PORT = 8000
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Pre-fork mode (Linux/macOS): the parent loads the model and data once and the workers share
+    # them copy-on-write, instead of every uvicorn worker loading its own copy
+    if settings.workers > 1 and hasattr(os, "fork"):
+        from services.prefork import run_prefork
+
+        run_prefork(app, HOST, PORT, settings.workers)
+    else:
+        uvicorn.run(app, host=HOST, port=PORT)
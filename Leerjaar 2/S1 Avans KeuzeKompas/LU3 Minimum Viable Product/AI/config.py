@@ -0,0 +1,107 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+# Central service configuration. Every value can be overridden with an environment variable
+# prefixed with KEUZEKOMPAS_, e.g. KEUZEKOMPAS_ENCODER_MODEL=all-MiniLM-L6-v2
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="KEUZEKOMPAS_", protected_namespaces=())
+
+    # Sentence transformer used for the student input and the motivation chunks
+    encoder_model: str = "paraphrase-multilingual-MiniLM-L12-v2"
+
+    # Encoder backend: "torch" (fp32), "torch-int8" (dynamic int8 quantisation, CPU), "onnx"
+    # (ONNX Runtime, needs sentence-transformers[onnx]) or "stub" (deterministic fake vectors for
+    # benchmarks). encoder_model_dir points to a local copy of the model (scripts/export_encoder.py)
+    # that is loaded without network access; encoder_onnx_file picks a specific export inside it,
+    # e.g. onnx/model_qint8_avx512_vnni.onnx
+    encoder_backend: str = "torch"
+    encoder_model_dir: str = ""
+    encoder_onnx_file: str = ""
+    encoder_offline: bool = False
+
+    # Precomputed module embeddings. The binary .npy store is memory-mapped; legacy
+    # .pkl/.csv files are still accepted and parsed once (see scripts/convert_embeddings.py)
+    embeddings_path: str = "data/processed/module_embeddings.npy"
+
+    # On-disk cache of the encoded module descriptions used by the motivations
+    description_embeddings_path: str = "data/processed/module_description_embeddings.npy"
+
+    # Cleaned module metadata used for the hard filters and the motivation texts
+    metadata_path: str = "data/cleaned/cleaned_dataset_soft-NLP.csv"
+    # Parsed (typed) copy of the metadata, keyed on the CSV's hash (services/catalogue.py).
+    # Empty: next to the CSV itself
+    catalogue_cache_dir: str = ""
+
+    # Text -> embedding LRU cache shared by the student input and the motivation chunks.
+    # A TTL of 0 keeps entries until they are evicted
+    embedding_cache_size: int = 10_000
+    embedding_cache_ttl_seconds: float = 3600
+
+    # Module retrieval index: "exact" (brute force) or "ivf" (approximate, for large catalogues).
+    # ann_nprobe trades recall for latency; candidate sets up to ann_exact_threshold are always
+    # searched exactly. ann_n_lists = 0 picks sqrt(catalogue size). "int8" and "float16" score a
+    # quantised copy of the matrix first and re-rank the best ann_rerank candidates exactly
+    ann_backend: str = "exact"
+    ann_nprobe: int = 8
+    ann_exact_threshold: int = 2048
+    ann_n_lists: int = 0
+    ann_rerank: int = 200
+
+    # Ranking: "dense" uses the sentence embeddings only, "hybrid" fuses them with BM25 over the
+    # hard-NLP catalogue text, which catches exact course terms the embeddings miss. fusion_method
+    # "rrf" is reciprocal rank fusion (fusion_rrf_k), "weighted" mixes min-max scaled scores
+    retrieval_mode: str = "dense"
+    fusion_method: str = "rrf"
+    fusion_rrf_k: int = 60
+    fusion_dense_weight: float = 0.7
+    bm25_k1: float = 1.5
+    bm25_b: float = 0.75
+
+    # Complete responses of repeated inputs (demo profiles, resubmitted forms), 0 disables.
+    # Emptied automatically when the embedding store is rebuilt
+    response_cache_size: int = 1024
+
+    # /predict/catalogue: page sizes, and the per-input rankings kept for paging (rows + scores,
+    # 8 bytes per module each)
+    catalogue_page_size: int = 20
+    catalogue_max_page_size: int = 100
+    ranking_cache_size: int = 256
+    ranking_cache_ttl_seconds: float = 1800
+
+    # Optional second stage: a cross-encoder re-ranks the best rerank_candidates of the retrieval.
+    # Empty switches it off; "stub" loads a deterministic fake for tests. The budget counts from the
+    # start of the request; candidates the cross-encoder has no time for keep their retrieval order
+    rerank_model: str = ""
+    rerank_candidates: int = 20
+    rerank_budget_ms: float = 250
+    rerank_batch_size: int = 8
+    rerank_max_length: int = 256
+
+    # Largest number of students accepted by /predict/batch, and the encoder batch size
+    max_batch_size: int = 512
+    encode_batch_size: int = 64
+
+    # Async inference path. Concurrent requests are coalesced into one encoder call when they
+    # arrive within microbatch_window_ms (up to microbatch_max_texts texts). The encoder and the
+    # NumPy pipeline get their own bounded thread pools. Beyond max_pending_requests in-flight
+    # requests the API answers 503 with a Retry-After header instead of queueing
+    microbatch_window_ms: float = 5
+    microbatch_max_texts: int = 256
+    encoder_workers: int = 1
+    pipeline_workers: int = 4
+    max_pending_requests: int = 64
+    retry_after_seconds: int = 1
+
+    # Number of pre-forked worker processes started by boot.py. Read-only artifacts (model weights,
+    # embeddings, indexes) are loaded once in the parent and shared copy-on-write
+    workers: int = 1
+
+    # Debug: add a Server-Timing header with the per-stage durations to every response
+    server_timing: bool = False
+
+    # Warm up the encoder(s), embeddings, filter index and one dummy inference at startup (in the
+    # background, see /ready) instead of on the first request
+    preload_models: bool = True
+
+
+settings = Settings()
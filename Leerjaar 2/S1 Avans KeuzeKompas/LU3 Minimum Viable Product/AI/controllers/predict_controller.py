@@ -1,20 +1,111 @@
-from fastapi import APIRouter
-from models.student_input import StudentInput
+import json
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from models.student_input import StudentInput, StudentInputColumns, validate_columns
 
 # Importing services
-from services.predict_service import get_top_5_prediction
+from services.predict_service import (
+    get_top_5_prediction_async,
+    get_top_5_predictions_batch_async,
+    ranked_catalogue_page_async,
+    stream_top_5_prediction,
+)
+from services.inference_pool import Overloaded
+from services.ranking_cache import InvalidCursor, StaleCursor
+from config import settings
 
 router = APIRouter(
     prefix="/predict",
     tags=["predict"]
 )
 
+# Backpressure: a full inference pipeline answers 503 right away, the client retries after a second
+def overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="De aanbevelingsservice is op dit moment te druk, probeer het zo opnieuw",
+        headers={"Retry-After": str(settings.retry_after_seconds)},
+    )
+
 # Endpoint: predict/ . POST: student input from front-end questionaire is taken in and recommendations are send back. 
 @router.post("/")
 # Data gets run through model field_testers to validate input. Things like negative credit points will return and code below controller doesn't run. -->Models\student_input.py
-def predict(data: StudentInput):
-    filtered_top_5_matches = get_top_5_prediction(data)
+# Async: the encoder and the ranking run on their own executors, so the event loop stays free
+async def predict(data: StudentInput):
+    try:
+        filtered_top_5_matches = await get_top_5_prediction_async(data)
+    except Overloaded:
+        raise overloaded()
 
     return {
         "filtered_top_5_matches": filtered_top_5_matches,
-    }
\ No newline at end of file
+    }
+
+# Endpoint: predict/stream . POST: same input as predict/, answered as NDJSON (one JSON object per line).
+# First line: {"event": "ranking", "filtered_top_5_matches": [...]} as soon as retrieval is done, then one
+# {"event": "motivation", "id": ..., "motivation": ...} per module and finally {"event": "done"}.
+@router.post("/stream")
+async def predict_stream(data: StudentInput):
+    events = stream_top_5_prediction(data)
+
+    # Retrieval runs before the response starts, so overload still gets a proper 503 instead of a broken stream
+    try:
+        ranking = await anext(events)
+    except Overloaded:
+        raise overloaded()
+
+    async def ndjson():
+        yield json.dumps(ranking) + "\n"
+        async for event in events:
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+# Endpoint: predict/batch . POST: list of student inputs (e.g. the nightly "recommend for all enrolled students" job).
+# All students are encoded and scored together; results come back in the same order as the input.
+@router.post("/batch")
+async def predict_batch(data: list[StudentInput]):
+    if len(data) > settings.max_batch_size:
+        raise HTTPException(status_code=413, detail=f"Maximaal {settings.max_batch_size} studenten per batch")
+
+    try:
+        results = await get_top_5_predictions_batch_async(data)
+    except Overloaded:
+        raise overloaded()
+
+    return {
+        "results": [{"filtered_top_5_matches": matches} for matches in results],
+    }
+
+# Endpoint: predict/catalogue . POST: same input as predict/, answered with the whole catalogue ranked by fit, one page
+# at a time: {"modules": [{"id", "similarity_score", "rank"}, ...], "total": n, "next_cursor": "..." or null}.
+# The next page is the same request with ?cursor=<next_cursor>; it is a slice of the cached ranking, not a new search.
+# filtered=true ranks only the modules that pass the hard filters.
+@router.post("/catalogue")
+async def predict_catalogue(
+    data: StudentInput,
+    cursor: str | None = None,
+    limit: int = Query(default=settings.catalogue_page_size, ge=1, le=settings.catalogue_max_page_size),
+    filtered: bool = False,
+):
+    try:
+        return await ranked_catalogue_page_async(data, cursor=cursor, limit=limit, filtered=filtered)
+    except Overloaded:
+        raise overloaded()
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Ongeldige cursor voor deze invoer")
+    except StaleCursor:
+        raise HTTPException(status_code=409, detail="De modulecatalogus is bijgewerkt, begin opnieuw bij de eerste pagina")
+
+# Endpoint: predict/validate . POST: columnar batch of student inputs (one list per field, see StudentInputColumns).
+# Checks every row against the same rules as predict/ in one vectorized pass, for validating large imports
+# before they are sent to predict/batch. Invalid rows are reported per field instead of failing the request.
+@router.post("/validate")
+def validate_batch(data: StudentInputColumns):
+    result = validate_columns(data)
+    return {
+        "rows": len(data),
+        "valid": int(result.valid.sum()),
+        "errors": [{"row": row, "errors": errors} for row, errors in result.errors.items()],
+    }
@@ -0,0 +1,50 @@
+from fastapi import APIRouter
+
+from services.model_registry import registry
+from services.embedding_cache import embedding_cache
+from services.response_cache import response_cache
+from services.ranking_cache import ranking_cache
+from services.reranker import loaded_reranker
+from services.inference_pool import inference_stats
+
+router = APIRouter(
+    prefix="/status",
+    tags=["status"]
+)
+
+# Endpoint: status/models . GET: load time and memory footprint of the loaded models, used to size pods.
+@router.get("/models")
+def model_status():
+    return registry.stats()
+
+
+# Endpoint: status/cache . GET: hit/miss counters of the text -> embedding cache.
+@router.get("/cache")
+def cache_status():
+    return embedding_cache.stats()
+
+
+# Endpoint: status/responses . GET: hit/miss counters of the full response cache.
+@router.get("/responses")
+def response_cache_status():
+    return response_cache.stats()
+
+
+# Endpoint: status/rankings . GET: hit/miss counters and memory of the cached catalogue rankings (predict/catalogue).
+@router.get("/rankings")
+def ranking_cache_status():
+    return ranking_cache.stats()
+
+
+# Endpoint: status/rerank . GET: how often the cross-encoder re-ranked all, part or none of the candidates within the budget.
+# Only reports on a model that is already loaded; polling it never loads the cross-encoder.
+@router.get("/rerank")
+def rerank_status():
+    reranker = loaded_reranker()
+    return {"loaded": True, **reranker.stats()} if reranker is not None else {"loaded": False}
+
+
+# Endpoint: status/inference . GET: micro-batch sizes, in-flight requests and rejected (503) requests.
+@router.get("/inference")
+def inference_status():
+    return inference_stats()
@@ -1,15 +1,64 @@
+import time
+from contextlib import asynccontextmanager
 from typing import Union
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from controllers.predict_controller import router as predict_router
+from controllers.status_controller import router as status_router
+from services.inference_pool import encoder_batcher
+from services.warmup import warmup
+from services.metrics import render_metrics, request_duration, server_timing_header, start_request
+from config import settings
 
-app = FastAPI()
+
+# Warm up in the background: shared models, module and description embeddings, the retrieval and
+# filter index and one dummy inference. /health answers right away, /ready only once this is done
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.preload_models:
+        warmup.start()
+    else:
+        warmup.skip()
+    yield
+    await encoder_batcher.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(predict_router)
+app.include_router(status_router)
+
+
+# Request latency per endpoint, plus the stage timings as a Server-Timing header when debugging
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    timings = start_request()
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    request_duration.observe(route.path if route is not None else "unmatched", time.perf_counter() - started)
+    if settings.server_timing and timings:
+        response.headers["Server-Timing"] = server_timing_header(timings)
+    return response
+
 
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
 
 
+# Async so it answers from the event loop even when every worker thread is busy with inference
 @app.get("/health")
-def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+async def health_check():
+    return {"status": "ok"}
+
+
+# Readiness probe: 503 until the warm-up has finished, with per-component load timings
+@app.get("/ready")
+async def readiness_check():
+    return JSONResponse(warmup.report(), status_code=200 if warmup.ready else 503)
+
+
+# Prometheus scrape endpoint: stage and request latency histograms
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,10 +1,136 @@
-from pydantic import BaseModel, Field, field_validator
+from dataclasses import dataclass
+
+import numpy as np
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 ALLOWED_LEVELS = {"NLQF1", "NLQF2", "NLQF3", "NLQF4", "NLQF5", "NLQF6", "NLQF7", "NLQF8"}
 ALLOWED_LANGUAGES = {"Nederlands", "Engels", "Niet van toepassing"}
 ALLOWED_LOCATIONS = {"Tilburg", "Breda", "Den Bosch", "Roosendaal"}
 ALLOWED_PERIODS = {"P1", "P2", "P3", "P4"}
 
+MAX_CREDITS = 30
+
+CREDIT_RANGE_SHAPE_MESSAGE = "Credit range must contain exactly two integers: (min, max)"
+NEGATIVE_CREDITS_MESSAGE = "Minimun aantal credits kan niet negatief zijn"
+INVERTED_CREDITS_MESSAGE = "Maximum aantal credits kan niet lager zijn dan het minimum aantal credits"
+TOO_MANY_CREDITS_MESSAGE = f"Het is niet mogelijk meer dan {MAX_CREDITS} studiepunten te verkrijgen met een VKM"
+EMPTY_STUDY_MESSAGE = "Huidige studie kan niet leeg zijn"
+EMPTY_TEXT_LIST_MESSAGE = "Leerdoelen en interesses kunnen niet leeg zijn"
+
+
+class ChoiceRule:
+    """
+    Allowed-value check for one field, compiled once at import: the allowed set, a sorted array of
+    it for np.isin and the joined options of the error message. StudentInput's field validators use
+    check() per object, validate_columns() uses check_column() on a whole batch at once.
+    """
+
+    def __init__(self, allowed: set[str], label: str, required_message: str | None = None):
+        self.allowed = frozenset(allowed)
+        self.allowed_array = np.array(sorted(allowed))
+        self.label = label
+        self.options = ", ".join(allowed)
+        self.required_message = required_message
+
+    def invalid_message(self, value) -> str:
+        return f"{self.label} '{value}' is ongeldig. Geldige opties zijn: {self.options}"
+
+    def check(self, values: list[str]) -> str | None:
+        # First problem of one object's list, or None
+        if not values and self.required_message:
+            return self.required_message
+        for value in values:
+            if value not in self.allowed:
+                return self.invalid_message(value)
+        return None
+
+    def check_value(self, value: str) -> str | None:
+        return None if value in self.allowed else self.invalid_message(value)
+
+    def check_column(self, column: list[list[str]]) -> dict[int, str]:
+        # row -> first problem, for a column of lists: one np.isin over all items of all rows
+        lengths, items, rows = _flatten(column)
+        errors = {}
+        invalid = ~np.isin(items, self.allowed_array)
+        if invalid.any():
+            # np.unique returns the first invalid item of every row, the same one check() reports
+            bad_rows, first = np.unique(rows[invalid], return_index=True)
+            for row, value in zip(bad_rows, items[invalid][first]):
+                errors[int(row)] = self.invalid_message(value)
+        if self.required_message:
+            for row in np.flatnonzero(lengths == 0):
+                errors[int(row)] = self.required_message
+        return errors
+
+    def check_value_column(self, column: list[str]) -> dict[int, str]:
+        values = np.array(column, dtype=str)
+        return {int(row): self.invalid_message(values[row]) for row in np.flatnonzero(~np.isin(values, self.allowed_array))}
+
+
+LOCATION_RULE = ChoiceRule(ALLOWED_LOCATIONS, "Locatievoorkeur", "Tenminste één locatievoorkeur is vereist")
+LEVEL_RULE = ChoiceRule(ALLOWED_LEVELS, "Niveauvoorkeur", "Tenminste één niveauvoorkeur is vereist")
+LANGUAGE_RULE = ChoiceRule(ALLOWED_LANGUAGES, "Taalvoorkeur")
+PERIOD_RULE = ChoiceRule(ALLOWED_PERIODS, "Periodevoorkeur", "Tenminste één periodevoorkeur is vereist")
+
+
+def _flatten(column: list[list[str]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Lists of strings -> (length per row, all items as one string array, row of every item)
+    lengths = np.fromiter((len(values) for values in column), dtype=np.int64, count=len(column))
+    items = np.array([value for values in column for value in values], dtype=str)
+    rows = np.repeat(np.arange(len(column)), lengths)
+    return lengths, items, rows
+
+
+def check_credit_range(min_credits: int, max_credits: int) -> str | None:
+    if min_credits < 0:
+        return NEGATIVE_CREDITS_MESSAGE
+    if max_credits < min_credits:
+        return INVERTED_CREDITS_MESSAGE
+    if max_credits > MAX_CREDITS:
+        return TOO_MANY_CREDITS_MESSAGE
+    return None
+
+
+def check_credit_range_column(column: list[tuple[int, int]]) -> dict[int, str]:
+    try:
+        credits = np.array(column, dtype=np.int64).reshape(-1, 2)
+    except OverflowError:
+        # pydantic accepts integers of any size; a batch with one outside int64 is checked per row,
+        # so that row gets its normal message instead of a server error
+        return {row: error for row, credit_range in enumerate(column) if (error := check_credit_range(*credit_range))}
+    min_credits, max_credits = credits[:, 0], credits[:, 1]
+    # Same order as check_credit_range: the first failing check of a row wins
+    message = np.select(
+        [min_credits < 0, max_credits < min_credits, max_credits > MAX_CREDITS],
+        [NEGATIVE_CREDITS_MESSAGE, INVERTED_CREDITS_MESSAGE, TOO_MANY_CREDITS_MESSAGE],
+        default="",
+    )
+    return {int(row): str(message[row]) for row in np.flatnonzero(message != "")}
+
+
+def check_text_list(values: list[str]) -> str | None:
+    if not values or not all(v.strip() for v in values):
+        return EMPTY_TEXT_LIST_MESSAGE
+    return None
+
+
+def _blank(values: list[str]) -> np.ndarray:
+    # One pass of str.strip over the flattened column; np.char.strip loops per element as well, but slower
+    return np.fromiter((not value.strip() for value in values), dtype=bool, count=len(values))
+
+
+def check_text_list_column(column: list[list[str]]) -> dict[int, str]:
+    lengths = np.fromiter((len(values) for values in column), dtype=np.int64, count=len(column))
+    rows = np.repeat(np.arange(len(column)), lengths)
+    blank_rows = rows[_blank([value for values in column for value in values])]
+    bad = np.union1d(np.flatnonzero(lengths == 0), blank_rows)
+    return {int(row): EMPTY_TEXT_LIST_MESSAGE for row in bad}
+
+
+def check_text_column(column: list[str]) -> dict[int, str]:
+    return {int(row): EMPTY_STUDY_MESSAGE for row in np.flatnonzero(_blank(column))}
+
+
 class StudentInput(BaseModel):
     current_study: str = Field(..., description="Je huidige studie")
     interests: list[str] = Field(..., description="Je interesses in zinnen en/of woorden")
@@ -15,60 +141,120 @@ class StudentInput(BaseModel):
     preferred_language: str = Field(..., description="Je taalsvoorkeur: 'Nederlands', 'Engels', 'Niet van toepassing'")
     preferred_period: list[str] = Field(..., description="Je voorkeur voor de periode waarin de VKM wordt gegeven")
 
+    # The validators delegate to the rules above, which validate_columns() applies to whole batches
+
     @field_validator("wanted_study_credit_range")
     def validate_credit_range(value):
         if not (isinstance(value, (list, tuple)) and len(value) == 2):
-            raise ValueError("Credit range must contain exactly two integers: (min, max)")
-        min_credits, max_credits = value
-        if min_credits < 0:
-            raise ValueError("Minimun aantal credits kan niet negatief zijn")
-        if max_credits < min_credits:
-            raise ValueError("Maximum aantal credits kan niet lager zijn dan het minimum aantal credits")
-        if max_credits > 30:
-            raise ValueError("Het is niet mogelijk meer dan 30 studiepunten te verkrijgen met een VKM")
+            raise ValueError(CREDIT_RANGE_SHAPE_MESSAGE)
+        error = check_credit_range(*value)
+        if error:
+            raise ValueError(error)
         return value
 
     @field_validator("current_study")
     def validate_current_study(value):
         if not value.strip():
-            raise ValueError("Huidige studie kan niet leeg zijn")
+            raise ValueError(EMPTY_STUDY_MESSAGE)
         return value
 
     @field_validator("learning_goals", "interests")
     def validate_lists(value):
-        if not value or not all(v.strip() for v in value):
-            raise ValueError("Leerdoelen en interesses kunnen niet leeg zijn")
+        error = check_text_list(value)
+        if error:
+            raise ValueError(error)
         return [v.strip() for v in value]
 
     @field_validator("location_preference")
     def validate_locations(value):
-        if not value:
-            raise ValueError("Tenminste één locatievoorkeur is vereist")
-        for location in value:
-            if location not in ALLOWED_LOCATIONS:
-                raise ValueError(f"Locatievoorkeur '{location}' is ongeldig. Geldige opties zijn: {', '.join(ALLOWED_LOCATIONS)}")
+        error = LOCATION_RULE.check(value)
+        if error:
+            raise ValueError(error)
         return value
 
     @field_validator("level_preference")
     def validate_levels(value):
-        if not value:
-            raise ValueError("Tenminste één niveauvoorkeur is vereist")
-        for level in value:
-            if level not in ALLOWED_LEVELS:
-                raise ValueError(f"Niveauvoorkeur '{level}' is ongeldig. Geldige opties zijn: {', '.join(ALLOWED_LEVELS)}")
+        error = LEVEL_RULE.check(value)
+        if error:
+            raise ValueError(error)
         return value
 
     @field_validator("preferred_language")
     def validate_language(value):
-        if value not in ALLOWED_LANGUAGES:
-            raise ValueError(f"Taalvoorkeur '{value}' is ongeldig. Geldige opties zijn: {', '.join(ALLOWED_LANGUAGES)}")
+        error = LANGUAGE_RULE.check_value(value)
+        if error:
+            raise ValueError(error)
         return value
-    
+
     @field_validator("preferred_period")
     def validate_period(value):
-        if not value:
-            raise ValueError("Tenminste één periodevoorkeur is vereist")
-        for period in value:
-            if period not in ALLOWED_PERIODS:
-                raise ValueError(f"Periodevoorkeur '{period}' is ongeldig. Geldige opties zijn: {', '.join(ALLOWED_PERIODS)}")
+        error = PERIOD_RULE.check(value)
+        if error:
+            raise ValueError(error)
         return value
+
+
+class StudentInputColumns(BaseModel):
+    """
+    A batch of student inputs in columnar form: one list per StudentInput field, row i of every
+    column together is student i. Pydantic only checks the types here; the business rules run
+    vectorized over whole columns in validate_columns().
+    """
+
+    current_study: list[str]
+    interests: list[list[str]]
+    wanted_study_credit_range: list[tuple[int, int]]
+    location_preference: list[list[str]]
+    learning_goals: list[list[str]]
+    level_preference: list[list[str]]
+    preferred_language: list[str]
+    preferred_period: list[list[str]]
+
+    @model_validator(mode="after")
+    def validate_lengths(self):
+        lengths = {len(column) for column in self.model_dump().values()}
+        if len(lengths) > 1:
+            raise ValueError("Alle kolommen moeten evenveel rijen bevatten")
+        return self
+
+    def __len__(self) -> int:
+        return len(self.current_study)
+
+    @classmethod
+    def from_records(cls, records: list[dict]) -> "StudentInputColumns":
+        return cls(**{field: [record.get(field) for record in records] for field in cls.model_fields})
+
+
+# Column checks in StudentInput field order; every row reports at most one error per field
+COLUMN_RULES = [
+    ("current_study", check_text_column),
+    ("interests", check_text_list_column),
+    ("wanted_study_credit_range", check_credit_range_column),
+    ("location_preference", LOCATION_RULE.check_column),
+    ("learning_goals", check_text_list_column),
+    ("level_preference", LEVEL_RULE.check_column),
+    ("preferred_language", LANGUAGE_RULE.check_value_column),
+    ("preferred_period", PERIOD_RULE.check_column),
+]
+
+
+@dataclass(frozen=True)
+class ColumnValidation:
+    """Outcome of validate_columns(): a validity mask and, per invalid row, its field errors."""
+
+    valid: np.ndarray
+    errors: dict[int, list[dict]]
+
+
+def validate_columns(columns: StudentInputColumns) -> ColumnValidation:
+    """
+    Bulk counterpart of StudentInput validation: the same rules and error messages, applied per
+    column with vectorized set membership instead of one validator call per field per object.
+    """
+    errors: dict[int, list[dict]] = {}
+    for field, check in COLUMN_RULES:
+        for row, message in check(getattr(columns, field)).items():
+            errors.setdefault(row, []).append({"field": field, "message": message})
+    valid = np.ones(len(columns), dtype=bool)
+    valid[list(errors)] = False
+    return ColumnValidation(valid=valid, errors=dict(sorted(errors.items())))
@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+import time
+
+# Allow running as `python scripts/build_embeddings.py` from the application root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config import settings
+from services.embedding_pipeline import build_module_embeddings, manifest_path_for
+
+
+# Rebuilds the module embedding store from the raw VKM catalogue. Only new or changed modules are
+# encoded; the rest is reused from the previous build (tracked in <target>.manifest.json).
+def main():
+    parser = argparse.ArgumentParser(description="Build the module embedding store from the raw catalogue")
+    parser.add_argument("--source", default="data/raw/Uitgebreide_VKM_dataset.csv", help="raw VKM catalogue CSV")
+    parser.add_argument("--target", default=settings.embeddings_path, help="output .npy matrix")
+    parser.add_argument("--model", default=settings.encoder_model, help="sentence transformer (must match the service)")
+    parser.add_argument("--backend", default=settings.encoder_backend, help="encoder backend, see config.py")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and re-encode every module")
+    parser.add_argument("--cleaned-output", help="also write the soft-NLP cleaned catalogue, e.g. " + settings.metadata_path)
+    args = parser.parse_args()
+
+    if not args.target.endswith(".npy"):
+        parser.error("target must end with .npy")
+
+    started = time.perf_counter()
+    manifest = build_module_embeddings(
+        args.source,
+        args.target,
+        args.model,
+        backend=args.backend,
+        batch_size=args.batch_size,
+        full=args.full,
+        cleaned_output=args.cleaned_output,
+    )
+
+    print(f"{manifest['count']} modules: {manifest['encoded']} encoded, {manifest['reused']} reused, "
+          f"{manifest['removed']} removed ({time.perf_counter() - started:.1f}s)")
+    print(f"Wrote {args.target} and {manifest_path_for(args.target)}")
+
+
+if __name__ == "__main__":
+    main()
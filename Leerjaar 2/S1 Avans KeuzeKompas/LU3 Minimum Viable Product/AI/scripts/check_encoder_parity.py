@@ -0,0 +1,78 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Allow running as `python scripts/check_encoder_parity.py` from the application root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config import settings
+from models.student_input import StudentInput
+from services.model_registry import encoder_id, registry
+from services.predict_service import combine_student_input, filter_matches_top_5
+
+FIXTURES = os.path.join(ROOT, "scripts", "fixtures", "student_inputs.json")
+
+
+def encode_fixtures(backend: str, texts: list[str], repeats: int):
+    model = registry.load(settings.encoder_model, backend=backend)
+    vectors = np.asarray(model.encode(texts, show_progress_bar=False), dtype=np.float32)
+
+    # Per-request latency: one text per call, like /predict/
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            model.encode([text], show_progress_bar=False)
+    latency_ms = (time.perf_counter() - started) * 1000 / (repeats * len(texts))
+    return vectors, latency_ms
+
+
+# Compares the module ranking of an encoder backend with the fp32 reference on the StudentInput
+# fixtures. Exits non-zero when the mean top 5 overlap drops below --min-overlap.
+def main():
+    parser = argparse.ArgumentParser(description="Check that an encoder backend ranks modules like fp32 torch")
+    parser.add_argument("--backend", default=settings.encoder_backend, help="backend under test, e.g. onnx")
+    parser.add_argument("--reference", default="torch", help="reference backend")
+    parser.add_argument("--fixtures", default=FIXTURES, help="JSON list of StudentInput objects")
+    parser.add_argument("--repeats", type=int, default=5, help="timing repetitions per fixture")
+    parser.add_argument("--min-overlap", type=float, default=1.0,
+                        help="required mean fraction of shared top 5 modules (1.0 = identical sets)")
+    args = parser.parse_args()
+
+    with open(args.fixtures, encoding="utf-8") as f:
+        students = [StudentInput(**item) for item in json.load(f)]
+    texts = [combine_student_input(data) for data in students]
+
+    reference, reference_ms = encode_fixtures(args.reference, texts, args.repeats)
+    candidate, candidate_ms = encode_fixtures(args.backend, texts, args.repeats)
+
+    same_set = same_order = 0
+    overlaps = []
+    for i, data in enumerate(students):
+        expected = [m["id"] for m in filter_matches_top_5(reference[i], data)]
+        actual = [m["id"] for m in filter_matches_top_5(candidate[i], data)]
+        cosine = float(reference[i] @ candidate[i] / (np.linalg.norm(reference[i]) * np.linalg.norm(candidate[i])))
+        overlaps.append(len(set(expected) & set(actual)) / len(expected) if expected else 1.0)
+        same_set += set(expected) == set(actual)
+        same_order += expected == actual
+        status = "ok" if expected == actual else ("reordered" if set(expected) == set(actual) else "DIFFERENT")
+        print(f"{i:>3} {status:<10} cosine={cosine:.4f} {expected} -> {actual}")
+
+    stats = registry.stats()["models"]
+    for backend, ms in ((args.reference, reference_ms), (args.backend, candidate_ms)):
+        model_stats = stats.get(encoder_id(settings.encoder_model, backend), {})
+        print(f"{backend:<12} {ms:8.2f} ms/request  rss +{model_stats.get('rss_delta_bytes', 0) / 2**20:.0f} MiB")
+    overlap = float(np.mean(overlaps))
+    print(f"top 5 identical: {same_order}/{len(students)}, same modules: {same_set}/{len(students)}, "
+          f"mean overlap: {overlap:.3f}")
+
+    sys.exit(0 if overlap >= args.min_overlap else 1)
+
+
+if __name__ == "__main__":
+    main()
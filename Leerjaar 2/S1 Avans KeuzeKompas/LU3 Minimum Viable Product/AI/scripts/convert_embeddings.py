@@ -0,0 +1,34 @@
+import argparse
+import os
+import sys
+
+# Allow running as `python scripts/convert_embeddings.py` from the application root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from services.embedding_store import ids_path_for, read_embeddings, write_binary_embeddings
+
+
+# Converts the notebook output (sentence_embedded_dataframe.pkl/.csv) into the binary store:
+# an L2-normalised matrix in .npy format plus a .ids.npy sidecar with the module ids.
+def main():
+    parser = argparse.ArgumentParser(description="Convert module embeddings to the binary .npy store")
+    parser.add_argument("source", help="sentence_embedded_dataframe .pkl or .csv")
+    parser.add_argument("target", help="output matrix path, e.g. data/processed/module_embeddings.npy")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32",
+                        help="float32 can be memory-mapped without a copy; float16 halves the file size")
+    args = parser.parse_args()
+
+    if not args.target.endswith(".npy"):
+        parser.error("target must end with .npy")
+
+    ids, matrix = read_embeddings(args.source)
+    write_binary_embeddings(args.target, ids, matrix, dtype=args.dtype)
+
+    print(f"Wrote {matrix.shape[0]} x {matrix.shape[1]} {args.dtype} matrix to {args.target}")
+    print(f"Wrote module ids to {ids_path_for(args.target)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Allow running as `python scripts/evaluate_quantization.py` from the application root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config import settings
+from models.student_input import StudentInput
+from services.ann_index import ExactIndex, QuantizedIndex
+from services.embedding_store import l2_normalize, read_embeddings
+
+FIXTURES = os.path.join(ROOT, "scripts", "fixtures", "student_inputs.json")
+
+
+def sample_queries(matrix: np.ndarray, n_queries: int, noise: float, seed: int) -> np.ndarray:
+    # Catalogue rows with Gaussian noise: queries that land near, not on, existing modules
+    rng = np.random.default_rng(seed)
+    rows = np.asarray(matrix[np.sort(rng.choice(matrix.shape[0], size=n_queries, replace=False))], dtype=np.float32)
+    return l2_normalize(rows + noise / np.sqrt(matrix.shape[1]) * rng.standard_normal(rows.shape, dtype=np.float32))
+
+
+def fixture_queries(path: str) -> np.ndarray:
+    # The reference students, encoded with the configured encoder
+    from services.model_registry import registry
+    from services.predict_service import combine_student_input
+
+    with open(path, encoding="utf-8") as f:
+        texts = [combine_student_input(StudentInput(**item)) for item in json.load(f)]
+    model = registry.load(settings.encoder_model)
+    return l2_normalize(np.asarray(model.encode(texts, show_progress_bar=False), dtype=np.float32))
+
+
+def baseline_top_k(matrix64: np.ndarray, query: np.ndarray, candidate_rows: np.ndarray, k: int) -> set:
+    scores = matrix64[candidate_rows] @ query.astype(np.float64)
+    return set(candidate_rows[np.argsort(-scores, kind="stable")[:k]].tolist())
+
+
+# Measures top-k recall of the quantised retrieval backends against an exact float64 baseline,
+# per re-rank depth and candidate-set size (the hard filters usually leave a fraction of the
+# catalogue). Exits non-zero when any configuration of --backends with the configured re-rank
+# depth (KEUZEKOMPAS_ANN_RERANK) falls below --min-recall.
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate int8/float16 first-pass scoring with exact re-rank")
+    parser.add_argument("--embeddings", default=settings.embeddings_path, help="module embedding store (.npy)")
+    parser.add_argument("--synthetic", type=int, default=0, help="use a random catalogue of this many modules instead")
+    parser.add_argument("--queries", type=int, default=200, help="sampled queries (noisy catalogue rows)")
+    parser.add_argument("--noise", type=float, default=1.0, help="query noise, relative to a unit vector")
+    parser.add_argument("--fixtures", help="also query with these StudentInputs, encoded (needs the encoder)")
+    parser.add_argument("--backends", default="int8,float16")
+    parser.add_argument("--rerank", default="5,50,200", help="re-rank depths; 5 (= k) means first pass only")
+    parser.add_argument("--fractions", default="1.0,0.1", help="candidate-set sizes as fractions of the catalogue")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--min-recall", type=float, default=0.99)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from benchmarks.synthetic import make_catalogue
+        _, matrix = make_catalogue(args.synthetic, seed=args.seed)
+        matrix = l2_normalize(matrix)
+    else:
+        _, matrix = read_embeddings(args.embeddings)
+    n_rows = matrix.shape[0]
+    matrix64 = np.asarray(matrix, dtype=np.float64)
+
+    queries = sample_queries(matrix, min(args.queries, n_rows), args.noise, args.seed)
+    if args.fixtures:
+        queries = np.vstack([queries, fixture_queries(args.fixtures)])
+
+    rng = np.random.default_rng(args.seed + 1)
+    candidate_sets = {
+        fraction: [
+            np.arange(n_rows) if fraction >= 1 else
+            np.sort(rng.choice(n_rows, size=max(args.k, int(n_rows * fraction)), replace=False))
+            for _ in range(len(queries))
+        ]
+        for fraction in (float(f) for f in args.fractions.split(","))
+    }
+    baselines = {
+        fraction: [baseline_top_k(matrix64, q, rows, args.k) for q, rows in zip(queries, sets)]
+        for fraction, sets in candidate_sets.items()
+    }
+
+    indexes = [("exact", 0, ExactIndex(matrix), matrix.nbytes)]
+    for backend in args.backends.split(","):
+        index = QuantizedIndex(matrix, backend)
+        for depth in (int(d) for d in args.rerank.split(",")):
+            indexes.append((backend, depth, index, index.nbytes))
+
+    print(f"{n_rows} modules, {len(queries)} queries, recall@{args.k} against exact float64")
+    print(f"{'backend':>8} {'rerank':>7} {'cands':>6} {'recall':>7} {'min':>6} {'ms/query':>9} {'first-pass MiB':>15}")
+    results = []
+    failed = False
+    for backend, depth, index, nbytes in indexes:
+        if depth:
+            index.rerank = depth
+        for fraction, sets in candidate_sets.items():
+            recalls = []
+            started = time.perf_counter()
+            for q, rows, expected in zip(queries, sets, baselines[fraction]):
+                found, _ = index.search(q, rows, args.k)
+                recalls.append(len(expected & set(found.tolist())) / len(expected))
+            ms = (time.perf_counter() - started) * 1000 / len(queries)
+            result = {
+                "backend": backend, "rerank": depth, "candidate_fraction": fraction,
+                "recall": round(float(np.mean(recalls)), 4), "min_recall": round(float(np.min(recalls)), 4),
+                "ms_per_query": round(ms, 3), "first_pass_bytes": int(nbytes),
+            }
+            results.append(result)
+            print(f"{backend:>8} {depth or '-':>7} {fraction:>6} {result['recall']:>7} {result['min_recall']:>6} "
+                  f"{ms:>9.3f} {nbytes / 2 ** 20:>15.1f}")
+            if depth == settings.ann_rerank and result["recall"] < args.min_recall:
+                failed = True
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"modules": n_rows, "queries": len(queries), "k": args.k, "results": results}, f, indent=2)
+    if failed:
+        print(f"recall below {args.min_recall} at the configured re-rank depth ({settings.ann_rerank})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
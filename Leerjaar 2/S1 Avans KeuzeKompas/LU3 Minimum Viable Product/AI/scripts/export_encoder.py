@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+
+# Allow running as `python scripts/export_encoder.py` from the application root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sentence_transformers import SentenceTransformer
+
+from config import settings
+
+
+# Saves the encoder to a local directory so pods can load it offline (KEUZEKOMPAS_ENCODER_MODEL_DIR).
+# With --backend onnx the ONNX export is included; --quantize adds an int8 ONNX model for the given CPU.
+def main():
+    parser = argparse.ArgumentParser(description="Export the sentence transformer to a local model directory")
+    parser.add_argument("target", help="output directory, e.g. data/encoder")
+    parser.add_argument("--model", default=settings.encoder_model, help="Hugging Face model name")
+    parser.add_argument("--backend", choices=["torch", "onnx"], default="onnx")
+    parser.add_argument("--quantize", choices=["arm64", "avx2", "avx512", "avx512_vnni"],
+                        help="also write a dynamically int8-quantised ONNX model (onnx backend only)")
+    args = parser.parse_args()
+
+    if args.quantize and args.backend != "onnx":
+        parser.error("--quantize requires --backend onnx")
+
+    model = SentenceTransformer(args.model, device="cpu", backend=args.backend)
+    model.save(args.target)
+    print(f"Saved {args.model} ({args.backend}) to {args.target}")
+
+    if args.quantize:
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        export_dynamic_quantized_onnx_model(model, args.quantize, args.target)
+        print(f"Wrote onnx/model_qint8_{args.quantize}.onnx; "
+              f"set KEUZEKOMPAS_ENCODER_ONNX_FILE=onnx/model_qint8_{args.quantize}.onnx to use it")
+
+
+if __name__ == "__main__":
+    main()
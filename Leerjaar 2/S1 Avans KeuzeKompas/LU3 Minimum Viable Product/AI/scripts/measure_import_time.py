@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# Allow running as `python scripts/measure_import_time.py` from the application root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded behind the model registry and the data loaders; importing the app must not pull them in
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers", "sklearn", "scipy", "pandas", "onnxruntime")
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module: str) -> list[dict]:
+    # One record per imported module from `python -X importtime`, times in microseconds
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    records = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append({"name": name, "self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                            "depth": (len(indent) - 1) // 2})
+    return records
+
+
+def time_to_health(url: str, timeout: float) -> float:
+    # Seconds from starting `uvicorn main:app` to the first 200 from /health
+    import httpx
+
+    started = time.perf_counter()
+    host, port = url.rsplit("//", 1)[1].split(":")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", host, "--port", port, "--log-level", "warning"],
+        cwd=ROOT,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError(f"{url}/health did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+# Measures how long importing the app takes (cold start of boot.py, every test import) with
+# -X importtime. Exits non-zero when the import exceeds --budget-ms or pulls in a heavy module.
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of the recommender API")
+    parser.add_argument("--module", default="main", help="module to import, e.g. main or services.predict_service")
+    parser.add_argument("--runs", type=int, default=5, help="imports to run; the fastest one is reported")
+    parser.add_argument("--top", type=int, default=15, help="packages to list, by total self time")
+    parser.add_argument("--budget-ms", type=float, default=1000, help="allowed import time of --module")
+    parser.add_argument("--allow", default="", help="comma-separated heavy modules that may be imported")
+    parser.add_argument("--health", action="store_true", help="also time uvicorn start to the first /health 200")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    # The first run also warms the OS file cache, the fastest run is the least noisy
+    runs = [import_times(args.module) for _ in range(max(1, args.runs))]
+    records = min(runs, key=lambda run: next(r["cumulative_us"] for r in run if r["name"] == args.module))
+    total_ms = next(r["cumulative_us"] for r in records if r["name"] == args.module) / 1000
+
+    by_package = defaultdict(int)
+    for record in records:
+        by_package[record["name"].split(".")[0]] += record["self_us"]
+    top = sorted(by_package.items(), key=lambda item: -item[1])[:args.top]
+
+    allowed = {name for name in args.allow.split(",") if name}
+    imported = {record["name"].split(".")[0] for record in records}
+    heavy = sorted(name for name in HEAVY_MODULES if name in imported and name not in allowed)
+
+    print(f"import {args.module}: {total_ms:.0f} ms (fastest of {len(runs)}), budget {args.budget_ms:.0f} ms")
+    print(f"{'package':<28} {'self ms':>8}")
+    for package, self_us in top:
+        print(f"{package:<28} {self_us / 1000:>8.1f}")
+    if heavy:
+        print(f"heavy modules imported: {', '.join(heavy)}")
+
+    health_s = None
+    if args.health:
+        health_s = time_to_health(args.url, timeout=60)
+        print(f"uvicorn start -> first /health 200: {health_s * 1000:.0f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "module": args.module,
+                "import_ms": round(total_ms, 1),
+                "budget_ms": args.budget_ms,
+                "packages_ms": {package: round(self_us / 1000, 1) for package, self_us in top},
+                "heavy_modules": heavy,
+                "health_ms": round(health_s * 1000, 1) if health_s is not None else None,
+            }, f, indent=2)
+
+    if total_ms > args.budget_ms or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
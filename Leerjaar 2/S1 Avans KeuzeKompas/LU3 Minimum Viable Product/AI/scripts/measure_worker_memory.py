@@ -0,0 +1,128 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+# Allow running as `python scripts/measure_worker_memory.py` from the application root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_PAYLOAD = {
+    "current_study": "Informatica",
+    "interests": ["programmeren", "data en AI"],
+    "wanted_study_credit_range": [0, 30],
+    "location_preference": ["Tilburg", "Breda", "Den Bosch", "Roosendaal"],
+    "learning_goals": ["leren samenwerken"],
+    "level_preference": ["NLQF5", "NLQF6"],
+    "preferred_language": "Niet van toepassing",
+    "preferred_period": ["P1", "P2", "P3", "P4"],
+}
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def smaps_rollup(pid: int) -> dict[str, int]:
+    # Memory counters of one process in bytes (Linux only). Pss splits every shared page
+    # between the processes that map it, so the Pss values add up to real memory use
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts and parts[0].rstrip(":") in SMAPS_FIELDS:
+                values[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    return values
+
+
+def process_tree(root_pid: int) -> list[int]:
+    # root_pid and all its descendants
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # The command name can contain spaces; the ppid is the 2nd field after it
+                    parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                pass
+    tree = [root_pid]
+    for pid in tree:
+        tree.extend(child for child, parent in parents.items() if parent == pid)
+    return tree
+
+
+def spawn(mode: str, workers: int, env: dict) -> subprocess.Popen:
+    if mode == "prefork":
+        env = {**env, "KEUZEKOMPAS_WORKERS": str(workers)}
+        command = [sys.executable, "boot.py"]
+    else:
+        # Baseline: uvicorn's own multi-worker mode, where every worker loads its own copy
+        command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000",
+                   "--workers", str(workers)]
+    return subprocess.Popen(command, cwd=ROOT, env=env)
+
+
+def wait_until_ready(url: str, workers: int, timeout: float) -> None:
+    # Every worker warms up on its own; require a run of consecutive 200s so all have answered
+    deadline = time.monotonic() + timeout
+    consecutive = 0
+    while consecutive < 4 * workers:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{url}/ready did not report ready within {timeout}s")
+        try:
+            consecutive = consecutive + 1 if httpx.get(f"{url}/ready", timeout=2).status_code == 200 else 0
+        except httpx.HTTPError:
+            consecutive = 0
+        time.sleep(0.1)
+
+
+# Reports the memory of a running server (--pid) or of one it starts itself (--spawn), per process
+# and per worker. Compare --mode prefork with --mode uvicorn to see what the shared pages save.
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory per worker of the recommender API (Linux)")
+    parser.add_argument("--pid", type=int, help="parent pid of an already running server")
+    parser.add_argument("--spawn", action="store_true", help="start the server, measure, stop it")
+    parser.add_argument("--mode", choices=["prefork", "uvicorn"], default="prefork")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=50, help="predictions sent before measuring")
+    parser.add_argument("--ready-timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    if not args.pid and not args.spawn:
+        parser.error("pass --pid of a running server or --spawn")
+
+    server = spawn(args.mode, args.workers, dict(os.environ)) if args.spawn else None
+    try:
+        root_pid = server.pid if server else args.pid
+        if server:
+            wait_until_ready(args.url, args.workers, args.ready_timeout)
+        for _ in range(args.requests):
+            httpx.post(f"{args.url}/predict/", json=FIXTURE_PAYLOAD, timeout=60)
+        time.sleep(1)
+
+        pids = process_tree(root_pid)
+        rows = {pid: smaps_rollup(pid) for pid in pids}
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    mib = 2 ** 20
+    print(f"{'pid':>8} {'rss':>9} {'pss':>9} {'shared':>9} {'private':>9}  (MiB)")
+    for pid, values in rows.items():
+        shared = values["Shared_Clean"] + values["Shared_Dirty"]
+        private = values["Private_Clean"] + values["Private_Dirty"]
+        label = " parent" if pid == root_pid else ""
+        print(f"{pid:>8} {values['Rss'] / mib:>9.1f} {values['Pss'] / mib:>9.1f} "
+              f"{shared / mib:>9.1f} {private / mib:>9.1f}{label}")
+
+    total_pss = sum(values["Pss"] for values in rows.values())
+    total_rss = sum(values["Rss"] for values in rows.values())
+    # The parent (and uvicorn's resource tracker) are shared overhead, spread over the workers
+    workers = args.workers
+    print(f"mode={args.mode} workers={workers}: total PSS {total_pss / mib:.1f} MiB "
+          f"(sum of RSS {total_rss / mib:.1f} MiB), {total_pss / workers / mib:.1f} MiB per worker")
+
+
+if __name__ == "__main__":
+    main()
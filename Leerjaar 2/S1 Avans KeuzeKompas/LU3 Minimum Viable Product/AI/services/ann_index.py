@@ -0,0 +1,222 @@
+import threading
+
+import numpy as np
+
+from config import settings
+from services.embedding_store import EmbeddingSnapshot, l2_normalize
+from services.topk import top_k_indices
+
+
+def _top_k_rows(rows: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    # Highest scores first; ties keep catalogue order
+    order = top_k_indices(scores, k)
+    return rows[order], scores[order]
+
+
+class ExactIndex:
+    """Brute-force cosine search over the (already filtered) candidate rows."""
+
+    name = "exact"
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = matrix
+
+    def scores(self, query: np.ndarray, candidate_rows: np.ndarray) -> np.ndarray:
+        # Cosine similarity of every candidate row, in candidate order
+        if candidate_rows.size * 4 > self.matrix.shape[0]:
+            # Most of the catalogue passes the filters: one contiguous matrix-vector product is
+            # cheaper than gathering the candidate rows into a copy first
+            return (self.matrix @ query)[candidate_rows]
+        return self.matrix[candidate_rows] @ query
+
+    def search(self, query: np.ndarray, candidate_rows: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        if candidate_rows.size == 0:
+            return candidate_rows, np.zeros(0, dtype=np.float32)
+        return _top_k_rows(candidate_rows, self.scores(query, candidate_rows), k)
+
+
+def _spherical_kmeans(vectors: np.ndarray, n_lists: int, iterations: int, seed: int) -> np.ndarray:
+    # k-means on the unit sphere: assign by dot product, centroids are re-normalised means
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=n_lists)
+        # Empty lists get a fresh random vector instead of collapsing
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()), replace=False)]
+        centroids = l2_normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file index in plain NumPy. The catalogue is clustered into n_lists cells and a
+    query only scores the modules in the nprobe closest cells: more probes means higher recall
+    and more latency. The hard-filter mask is applied to the probed rows before scoring, and
+    small candidate sets (or probes that come back short) fall back to the exact search.
+    """
+
+    name = "ivf"
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        n_lists: int = 0,
+        nprobe: int = 8,
+        exact_threshold: int = 2048,
+        iterations: int = 10,
+        train_size: int = 50_000,
+        seed: int = 42,
+    ):
+        self.matrix = matrix
+        self.exact = ExactIndex(matrix)
+        self.exact_threshold = exact_threshold
+
+        n_rows = matrix.shape[0]
+        self.n_lists = min(n_lists or max(1, int(np.sqrt(n_rows))), n_rows)
+        self.nprobe = max(1, min(nprobe, self.n_lists))
+
+        rng = np.random.default_rng(seed)
+        train_rows = rng.choice(n_rows, size=min(train_size, n_rows), replace=False)
+        train = np.asarray(matrix[np.sort(train_rows)], dtype=np.float32)
+        self.centroids = _spherical_kmeans(train, self.n_lists, iterations, seed)
+
+        # Assign the full catalogue in chunks to keep the temporary score matrix small
+        assignments = np.empty(n_rows, dtype=np.int64)
+        for start in range(0, n_rows, 65_536):
+            block = np.asarray(matrix[start:start + 65_536], dtype=np.float32)
+            assignments[start:start + 65_536] = np.argmax(block @ self.centroids.T, axis=1)
+
+        order = np.argsort(assignments, kind="stable")
+        boundaries = np.cumsum(np.bincount(assignments, minlength=self.n_lists))[:-1]
+        self.list_rows = np.split(order, boundaries)
+
+    def search(
+        self,
+        query: np.ndarray,
+        candidate_rows: np.ndarray,
+        k: int,
+        nprobe: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if candidate_rows.size <= max(self.exact_threshold, k):
+            return self.exact.search(query, candidate_rows, k)
+
+        nprobe = max(1, min(nprobe or self.nprobe, self.n_lists))
+        centroid_scores = self.centroids @ query
+        probed = top_k_indices(centroid_scores, nprobe)
+        rows = np.sort(np.concatenate([self.list_rows[cell] for cell in probed]))
+
+        # Pre-filter: only modules that passed the hard filters are scored
+        allowed = np.zeros(self.matrix.shape[0], dtype=bool)
+        allowed[candidate_rows] = True
+        rows = rows[allowed[rows]]
+
+        if rows.size < k:
+            return self.exact.search(query, candidate_rows, k)
+
+        scores = self.matrix[rows] @ query
+        return _top_k_rows(rows, scores, k)
+
+
+def quantize_int8(matrix: np.ndarray, block_rows: int = 65_536) -> tuple[np.ndarray, np.ndarray]:
+    # Symmetric per-row quantisation: row ~= codes * scale, with scale = max |x| / 127
+    codes = np.empty(matrix.shape, dtype=np.int8)
+    scales = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], block_rows):
+        block = np.asarray(matrix[start:start + block_rows], dtype=np.float32)
+        scale = np.abs(block).max(axis=1) / 127
+        scale[scale == 0] = 1
+        codes[start:start + block_rows] = np.rint(block / scale[:, None])
+        scales[start:start + block_rows] = scale
+    return codes, scales
+
+
+class QuantizedIndex:
+    """
+    First pass over a compact copy of the matrix, then an exact re-rank. The copy is int8 codes
+    with a scale per row (a quarter of the float32 bytes) or float16 (half). It is widened to
+    float32 block by block, so every block stays in cache and the memory traffic is the compact
+    size. Only the best `rerank` candidates (at least k) are scored again on the float32 matrix,
+    so its (memory-mapped) pages are hardly touched. Candidate sets up to that many are searched
+    exactly.
+    """
+
+    def __init__(self, matrix: np.ndarray, dtype: str = "int8", rerank: int = 200, block_rows: int = 1024):
+        if rerank < 0:
+            raise ValueError(f"The re-rank depth (KEUZEKOMPAS_ANN_RERANK) cannot be negative, got {rerank}")
+        self.matrix = matrix
+        self.exact = ExactIndex(matrix)
+        self.name = dtype
+        self.rerank = rerank
+        self.block_rows = block_rows
+        if dtype == "int8":
+            self.codes, self.scales = quantize_int8(matrix)
+        elif dtype == "float16":
+            self.codes, self.scales = np.asarray(matrix, dtype=np.float16), None
+        else:
+            raise ValueError(f"Unsupported quantisation '{dtype}'. Options: int8, float16")
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def approximate_scores(self, query: np.ndarray, candidate_rows: np.ndarray) -> np.ndarray:
+        # Most of the catalogue: walk the contiguous codes; a small subset: gather its codes first
+        whole = candidate_rows.size * 4 > self.codes.shape[0]
+        codes = self.codes if whole else self.codes[candidate_rows]
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], self.block_rows):
+            block = codes[start:start + self.block_rows].astype(np.float32)
+            scores[start:start + self.block_rows] = block @ query
+        if self.scales is not None:
+            scores *= self.scales if whole else self.scales[candidate_rows]
+        return scores[candidate_rows] if whole else scores
+
+    def search(self, query: np.ndarray, candidate_rows: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        # A shortlist shorter than k would return fewer than k modules
+        depth = max(self.rerank, k)
+        if candidate_rows.size <= depth:
+            return self.exact.search(query, candidate_rows, k)
+        shortlist = candidate_rows[top_k_indices(self.approximate_scores(query, candidate_rows), depth)]
+        # Exact float32 re-rank; the shortlist goes back to catalogue order so ties stay stable
+        shortlist = np.sort(shortlist)
+        return _top_k_rows(shortlist, self.matrix[shortlist] @ query, k)
+
+
+# Pluggable backends, selected with KEUZEKOMPAS_ANN_BACKEND
+ANN_BACKENDS = {
+    "exact": lambda matrix: ExactIndex(matrix),
+    "int8": lambda matrix: QuantizedIndex(matrix, "int8", rerank=settings.ann_rerank),
+    "float16": lambda matrix: QuantizedIndex(matrix, "float16", rerank=settings.ann_rerank),
+    "ivf": lambda matrix: IVFIndex(
+        matrix,
+        n_lists=settings.ann_n_lists,
+        nprobe=settings.ann_nprobe,
+        exact_threshold=settings.ann_exact_threshold,
+    ),
+}
+
+_index: tuple[str, object] | None = None
+_index_lock = threading.Lock()
+
+
+def get_ann_index(snapshot: EmbeddingSnapshot):
+    # One index per embedding snapshot (and backend); rebuilt when the embedding store reloads
+    global _index
+    key = f"{snapshot.version}:{settings.ann_backend}"
+    current = _index
+    if current is not None and current[0] == key:
+        return current[1]
+
+    with _index_lock:
+        current = _index
+        if current is None or current[0] != key:
+            if settings.ann_backend not in ANN_BACKENDS:
+                raise ValueError(f"Unknown ANN backend '{settings.ann_backend}'. Options: {', '.join(ANN_BACKENDS)}")
+            current = (key, ANN_BACKENDS[settings.ann_backend](snapshot.matrix))
+            _index = current
+        return current[1]
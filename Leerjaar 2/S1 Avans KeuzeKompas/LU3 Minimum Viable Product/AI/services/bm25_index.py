@@ -0,0 +1,215 @@
+import functools
+import re
+import string
+import threading
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from config import settings
+from services.catalogue import catalogue_digest, load_catalogue
+from services.embedding_pipeline import SOFT_NLP_COLUMNS
+from services.embedding_store import EmbeddingSnapshot
+
+# scipy and pandas are only needed once an index is built (hybrid mode), not to import the app
+if TYPE_CHECKING:
+    import pandas as pd
+
+_DIGITS = re.compile(r"\d+")
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+
+class HardNLP:
+    """
+    Hard NLP of the TF-IDF notebooks (helpers/functs/NLP.py): lower case, no digits or punctuation,
+    stop words removed and words stemmed, Dutch or English depending on the detected language.
+    Stop word sets and stemmers are built once here instead of on every call, and the language
+    detector is seeded so the same text always gives the same tokens.
+    Needs nltk (with the stopwords and wordnet corpora) and langdetect.
+    """
+
+    def __init__(self):
+        from langdetect import DetectorFactory, LangDetectException, detect
+        from nltk.corpus import stopwords
+        from nltk.stem import PorterStemmer, SnowballStemmer, WordNetLemmatizer
+
+        DetectorFactory.seed = 0
+        self._detect = detect
+        self._detect_error = LangDetectException
+        self.stopwords = {
+            "nl": frozenset(stopwords.words("dutch")),
+            "en": frozenset(stopwords.words("english")),
+        }
+        self.stopwords["fallback"] = self.stopwords["nl"] | self.stopwords["en"]
+        self._stem_nl = SnowballStemmer("dutch").stem
+        self._stem_en = PorterStemmer().stem
+        self._lemmatize_en = WordNetLemmatizer().lemmatize
+
+    def language(self, text: str) -> str:
+        try:
+            lang = self._detect(text)
+        except self._detect_error:
+            return "fallback"
+        return lang if lang in ("nl", "en") else "fallback"
+
+    @functools.lru_cache(maxsize=100_000)
+    def stem(self, word: str, lang: str) -> str:
+        # Only Dutch gets the Snowball stemmer; English and everything else lemmatize + Porter
+        if lang == "nl":
+            return self._stem_nl(word)
+        return self._stem_en(self._lemmatize_en(word))
+
+    def __call__(self, text):
+        if not isinstance(text, str):
+            return text
+        text = _DIGITS.sub("", text.lower()).translate(_PUNCTUATION)
+        lang = self.language(text)
+        stop = self.stopwords[lang]
+        return " ".join(self.stem(word, lang) for word in text.split() if word not in stop)
+
+
+@functools.lru_cache(maxsize=1)
+def get_hard_nlp() -> HardNLP:
+    return HardNLP()
+
+
+def hard_nlp(text):
+    return get_hard_nlp()(text)
+
+
+@functools.lru_cache(maxsize=4096)
+def query_terms(text: str) -> tuple[str, ...]:
+    # Language detection makes hard NLP the slow part of a sparse query, so repeats are cached
+    return tuple(hard_nlp(text).split())
+
+
+def catalogue_terms(metadata_df: "pd.DataFrame") -> list[list[str]]:
+    # Same fields as the dense module text, hard NLP per field like notebook 2.2 did per column
+    columns = [col for col in SOFT_NLP_COLUMNS if col in metadata_df.columns]
+    return [
+        [term for col in columns if isinstance(row[col], str) for term in hard_nlp(row[col]).split()]
+        for row in metadata_df[columns].to_dict("records")
+    ]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over the hard-NLP catalogue text. The per-(term, module) BM25 weights are computed
+    once and stored as a term-major CSR matrix, so scoring a query only sums the rows of its own
+    terms: a few sparse rows instead of a pass over the whole vocabulary.
+    """
+
+    name = "bm25"
+
+    def __init__(self, ids: np.ndarray, documents: list[list[str]], k1: float = 1.5, b: float = 0.75):
+        from scipy import sparse
+
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.vocabulary: dict[str, int] = {}
+        indices = [self.vocabulary.setdefault(term, len(self.vocabulary)) for doc in documents for term in doc]
+        indptr = np.cumsum([0] + [len(doc) for doc in documents])
+        counts = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.asarray(indices, dtype=np.int64), indptr),
+            shape=(len(documents), max(len(self.vocabulary), 1)),
+        )
+        counts.sum_duplicates()
+
+        n_docs = max(len(documents), 1)
+        doc_lengths = np.asarray(counts.sum(axis=1)).ravel()
+        avg_length = doc_lengths.mean() if doc_lengths.size and doc_lengths.mean() > 0 else 1.0
+        doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+        # Lucene's idf variant: never negative, also for terms in more than half the modules
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+        tf = counts.data
+        row_lengths = np.repeat(doc_lengths, np.diff(counts.indptr))
+        counts.data = (idf[counts.indices] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * row_lengths / avg_length))).astype(np.float32)
+        self.term_matrix = counts.T.tocsr()
+
+        self._aligned: tuple[str, np.ndarray] | None = None
+
+    @classmethod
+    def from_csv(cls, metadata_path: str, k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        metadata_df = load_catalogue(metadata_path, settings.catalogue_cache_dir)
+        return cls(metadata_df["id"].to_numpy(), catalogue_terms(metadata_df), k1=k1, b=b)
+
+    def module_scores(self, terms) -> np.ndarray:
+        # BM25 score of every module (metadata order); repeated query terms count repeatedly
+        term_ids = [self.vocabulary[term] for term in terms if term in self.vocabulary]
+        if not term_ids:
+            return np.zeros(len(self.ids), dtype=np.float32)
+        return np.asarray(self.term_matrix[term_ids].sum(axis=0), dtype=np.float32).ravel()
+
+    def scores(self, terms, snapshot: EmbeddingSnapshot, rows: np.ndarray) -> np.ndarray:
+        # BM25 scores for embedding-matrix rows; modules missing from the metadata score 0
+        padded = np.append(self.module_scores(terms), np.float32(0))
+        return padded[self._module_positions(snapshot)[rows]]
+
+    def _module_positions(self, snapshot: EmbeddingSnapshot) -> np.ndarray:
+        # Embedding row -> metadata position (the padding slot when unknown), rebuilt per snapshot
+        aligned = self._aligned
+        if aligned is None or aligned[0] != snapshot.version:
+            position = {int(module_id): i for i, module_id in enumerate(self.ids)}
+            positions = np.array([position.get(int(module_id), len(self.ids)) for module_id in snapshot.ids], dtype=np.int64)
+            aligned = (snapshot.version, positions)
+            self._aligned = aligned
+        return aligned[1]
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    # 1 for the highest score; ties keep catalogue order
+    order = np.argsort(-scores, kind="stable")
+    ranks = np.empty(len(scores), dtype=np.float64)
+    ranks[order] = np.arange(1, len(scores) + 1)
+    return ranks
+
+
+def reciprocal_rank_fusion(dense: np.ndarray, sparse_scores: np.ndarray, k: int = 60) -> np.ndarray:
+    # Modules without a single query term get no sparse contribution, rather than a tied rank
+    fused = 1.0 / (k + _ranks(dense))
+    matched = sparse_scores > 0
+    fused[matched] += 1.0 / (k + _ranks(sparse_scores)[matched])
+    return fused
+
+
+def _min_max(scores: np.ndarray) -> np.ndarray:
+    low, high = float(scores.min()), float(scores.max())
+    if high <= low:
+        return np.zeros(len(scores), dtype=np.float64)
+    return (scores - low) / (high - low)
+
+
+def weighted_fusion(dense: np.ndarray, sparse_scores: np.ndarray, dense_weight: float = 0.7) -> np.ndarray:
+    # Both score lists min-max scaled over the candidates, then mixed
+    return dense_weight * _min_max(dense) + (1 - dense_weight) * _min_max(sparse_scores)
+
+
+# Fusion of dense and BM25 scores, selected with KEUZEKOMPAS_FUSION_METHOD
+FUSION_METHODS = {
+    "rrf": lambda dense, sparse_scores: reciprocal_rank_fusion(dense, sparse_scores, k=settings.fusion_rrf_k),
+    "weighted": lambda dense, sparse_scores: weighted_fusion(dense, sparse_scores, dense_weight=settings.fusion_dense_weight),
+}
+
+
+def fuse_scores(dense: np.ndarray, sparse_scores: np.ndarray) -> np.ndarray:
+    if settings.fusion_method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method '{settings.fusion_method}'. Options: {', '.join(FUSION_METHODS)}")
+    return FUSION_METHODS[settings.fusion_method](dense, sparse_scores)
+
+
+_indexes: dict[str, tuple[str, BM25Index]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_bm25_index(metadata_path: str = settings.metadata_path) -> BM25Index:
+    # One index per metadata file, built on first use (or during the warm-up in hybrid mode) and
+    # rebuilt when the file's content changes
+    digest = catalogue_digest(metadata_path)
+    entry = _indexes.get(metadata_path)
+    if entry is None or entry[0] != digest:
+        with _indexes_lock:
+            entry = _indexes.get(metadata_path)
+            if entry is None or entry[0] != digest:
+                entry = (digest, BM25Index.from_csv(metadata_path, k1=settings.bm25_k1, b=settings.bm25_b))
+                _indexes[metadata_path] = entry
+    return entry[1]
@@ -0,0 +1,191 @@
+import ast
+import hashlib
+import os
+import pickle
+import re
+import threading
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+# Shared catalogue loader: the service and the notebook pipelines (which import this module
+# through helpers/functs/catalogue.py) use it. Only pandas and NumPy, no service settings, so it
+# imports outside the service too. pandas is imported on first use, so importing stays cheap.
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Bump when parse_catalogue changes, so caches written by an older version are not read
+CATALOGUE_FORMAT_VERSION = 1
+
+NUMERIC_COLUMNS = ("id", "studycredit", "contact_id", "available_spots", "estimated_difficulty",
+                   "interests_match_score", "popularity_score")
+
+# Dutch school year quarters (school year starts in September)
+MONTH_PERIODS = {9: "P1", 10: "P1", 11: "P1", 12: "P2", 1: "P2", 2: "P2",
+                 3: "P3", 4: "P3", 5: "P3", 6: "P4", 7: "P4", 8: "P4"}
+
+
+def parse_locations(value) -> list[str]:
+    # The CSVs store a string like "['Den Bosch']"; a plain name becomes a list of one
+    if isinstance(value, list):
+        return value
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, str):
+        s = value.strip()
+        if s.startswith("[") and s.endswith("]"):
+            try:
+                parsed = ast.literal_eval(s)
+                if isinstance(parsed, list):
+                    return [str(x) for x in parsed]
+            except (ValueError, SyntaxError):
+                pass
+        return [s]
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    return [str(value)]
+
+
+def parse_catalogue(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Typed columns from the text of a catalogue CSV: numbers as numbers, location as a list of
+    names, start_date as a datetime and a period column (P1-P4, None when the month is unknown)
+    derived from it. Columns a CSV does not have are left out.
+    """
+    import pandas as pd
+
+    df = df.copy()
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    if "location" in df.columns:
+        df["location"] = [parse_locations(value) for value in df["location"]]
+    if "start_date" in df.columns:
+        df["start_date"] = pd.to_datetime(df["start_date"], errors="coerce")
+        if "period" not in df.columns:
+            df["period"] = pd.Series(df["start_date"].dt.month.map(MONTH_PERIODS), dtype=object)
+            df["period"] = df["period"].where(df["period"].notna(), None)
+    return df
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+_digests: dict[str, tuple[tuple[int, int], str]] = {}
+
+
+def catalogue_digest(path: str) -> str:
+    """
+    SHA-256 of a catalogue file. The file is only hashed again when its size or modification
+    time changes, so a call costs one stat; caches built from the catalogue key on this to see
+    that the file was replaced.
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = os.path.abspath(path)
+    known = _digests.get(key)
+    if known is not None and known[0] == signature:
+        return known[1]
+    digest = file_sha256(path)
+    _digests[key] = (signature, digest)
+    return digest
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _write_cache(df: "pd.DataFrame", path: str) -> None:
+    # Written under a temporary name and renamed, so a crash never leaves half a cache behind
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if path.endswith(".parquet"):
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _read_cache(path: str) -> "pd.DataFrame":
+    import pandas as pd
+
+    if not path.endswith(".parquet"):
+        return pd.read_pickle(path)
+    df = pd.read_parquet(path)
+    # Parquet hands list columns back as arrays
+    if "location" in df.columns:
+        df["location"] = [parse_locations(value) for value in df["location"]]
+    return df
+
+
+def cache_path_for(source_path: str, digest: str, cache_dir: str | None = None) -> str:
+    # <cache_dir>/<csv name>.<source hash>.parquet (.pkl without pyarrow)
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    extension = "parquet" if _parquet_available() else "pkl"
+    key = f"{digest[:16]}v{CATALOGUE_FORMAT_VERSION}"
+    return os.path.join(cache_dir or os.path.dirname(source_path), f"{stem}.{key}.{extension}")
+
+
+_loaded: dict[tuple[str, str | None], tuple[str, "pd.DataFrame"]] = {}
+_loaded_lock = threading.Lock()
+
+
+def load_catalogue(path: str, cache_dir: str | None = None) -> "pd.DataFrame":
+    """
+    The parsed catalogue of a CSV, read from a binary cache keyed on the CSV's SHA-256 when one
+    exists, parsed and cached otherwise. Within a process the frame is shared until the file's
+    digest changes, so treat it as read-only. A cache that cannot be written (read-only filesystem)
+    only costs the parse on the next start.
+    """
+    digest = catalogue_digest(path)
+    memo_key = (os.path.abspath(path), cache_dir)
+    loaded = _loaded.get(memo_key)
+    if loaded is not None and loaded[0] == digest:
+        return loaded[1]
+
+    with _loaded_lock:
+        loaded = _loaded.get(memo_key)
+        if loaded is not None and loaded[0] == digest:
+            return loaded[1]
+
+        cache_path = cache_path_for(path, digest, cache_dir)
+        df = None
+        if os.path.exists(cache_path):
+            try:
+                df = _read_cache(cache_path)
+            except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+                df = None
+        if df is None:
+            import pandas as pd
+
+            df = parse_catalogue(pd.read_csv(path, low_memory=False))
+            try:
+                os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+                _write_cache(df, cache_path)
+                _remove_stale_caches(path, cache_path)
+            except OSError:
+                pass
+
+        _loaded[memo_key] = (digest, df)
+        return df
+
+
+def _remove_stale_caches(source_path: str, current: str) -> None:
+    # Caches of earlier versions of the same CSV (or of an older format)
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    pattern = re.compile(re.escape(stem) + r"\.[0-9a-f]{16}v\d+\.(parquet|pkl)")
+    directory = os.path.dirname(current) or "."
+    for name in os.listdir(directory):
+        if pattern.fullmatch(name) and name != os.path.basename(current):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from config import settings
+from services.catalogue import catalogue_digest, load_catalogue
+from services.embedding_store import l2_normalize, read_embeddings, write_binary_embeddings
+from services.model_registry import encoder_id, registry
+
+# pandas is imported where it is used, so importing the app stays fast (scripts/measure_import_time.py)
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Metadata columns that together form the module description used for the motivations
+DESCRIPTION_COLUMNS = ["modulename", "description", "content", "learninggoals"]
+
+
+def build_module_descriptions(metadata_df: "pd.DataFrame") -> dict[int, str]:
+    import pandas as pd
+
+    # Build module description from available fields; modules without any text are left out
+    descriptions = {}
+    for row in metadata_df.to_dict("records"):
+        parts = []
+        for col in DESCRIPTION_COLUMNS:
+            value = row.get(col)
+            if value is not None and pd.notna(value) and str(value).strip():
+                parts.append(str(value))
+        description = ". ".join(parts)
+        if description.strip():
+            descriptions[int(row["id"])] = description
+    return descriptions
+
+
+def _fingerprint(model_name: str, descriptions: dict[int, str]) -> str:
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    for module_id in sorted(descriptions):
+        digest.update(f"\n{module_id}\t{descriptions[module_id]}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _meta_path_for(path: str) -> str:
+    return path[:-len(".npy")] + ".meta.json"
+
+
+@dataclass(frozen=True)
+class DescriptionSnapshot:
+    ids: np.ndarray
+    matrix: np.ndarray
+    row_of: dict[int, int]
+
+
+class DescriptionStore:
+    """
+    L2-normalised embeddings of every module description. Module text never changes between
+    requests, so the descriptions are encoded once (in one batch) and cached on disk next to
+    the module matrix. The cache is keyed on the encoder (model and backend) and the description
+    texts and rebuilt automatically when either changes. A replaced metadata file is picked up
+    by the next get().
+    """
+
+    def __init__(self, path: str | None, metadata_path: str, model_name: str):
+        self.path = path
+        self.metadata_path = metadata_path
+        self.model_name = model_name
+        self._snapshot: DescriptionSnapshot | None = None
+        self._digest: str | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> DescriptionSnapshot:
+        return self._load(encode=True)
+
+    def load_cached(self) -> DescriptionSnapshot | None:
+        # Only the on-disk cache, when it matches the encoder and the descriptions; None on a miss.
+        # Never encodes, so it is safe in a pre-fork parent (see services/prefork.py)
+        return self._load(encode=False)
+
+    def _load(self, encode: bool) -> DescriptionSnapshot | None:
+        with self._lock:
+            digest = catalogue_digest(self.metadata_path)
+            descriptions = build_module_descriptions(load_catalogue(self.metadata_path, settings.catalogue_cache_dir))
+            fingerprint = _fingerprint(encoder_id(self.model_name), descriptions)
+
+            ids, matrix = self._read_cache(fingerprint)
+            if ids is None:
+                if not encode:
+                    return None
+                ids = np.fromiter(descriptions.keys(), dtype=np.int64, count=len(descriptions))
+                matrix = self._encode([descriptions[int(i)] for i in ids])
+                self._write_cache(ids, matrix, fingerprint)
+
+            self._snapshot = DescriptionSnapshot(
+                ids=ids,
+                matrix=matrix,
+                row_of={int(module_id): row for row, module_id in enumerate(ids)},
+            )
+            self._digest = digest
+            return self._snapshot
+
+    def get(self) -> DescriptionSnapshot:
+        # One stat of the metadata file per call; reloads when its content changed
+        snapshot = self._snapshot
+        if snapshot is None or self._digest != catalogue_digest(self.metadata_path):
+            return self.load()
+        return snapshot
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        model = registry.get(self.model_name)
+        vectors = model.encode(texts, batch_size=settings.encode_batch_size, show_progress_bar=False)
+        return l2_normalize(np.asarray(vectors, dtype=np.float32))
+
+    def _read_cache(self, fingerprint: str):
+        if self.path is None:
+            return None, None
+        try:
+            with open(_meta_path_for(self.path)) as f:
+                if json.load(f).get("fingerprint") != fingerprint:
+                    return None, None
+            return read_embeddings(self.path)
+        except (OSError, ValueError):
+            return None, None
+
+    def _write_cache(self, ids: np.ndarray, matrix: np.ndarray, fingerprint: str) -> None:
+        # A read-only filesystem only costs us the cache; the vectors stay in memory
+        if self.path is None:
+            return
+        try:
+            write_binary_embeddings(self.path, ids, matrix)
+            with open(_meta_path_for(self.path), "w") as f:
+                json.dump({"model": encoder_id(self.model_name), "fingerprint": fingerprint, "count": len(ids)}, f)
+        except OSError:
+            pass
+
+
+_stores: dict[str, DescriptionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_description_store(metadata_path: str = settings.metadata_path) -> DescriptionStore:
+    # Only the configured catalogue gets an on-disk cache; other metadata files are kept in memory
+    store = _stores.get(metadata_path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(metadata_path)
+            if store is None:
+                cache_path = settings.description_embeddings_path if metadata_path == settings.metadata_path else None
+                store = DescriptionStore(cache_path, metadata_path, settings.encoder_model)
+                _stores[metadata_path] = store
+    return store
@@ -0,0 +1,98 @@
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+from config import settings
+from services.model_registry import encoder_id, registry
+
+
+def normalize_text(text: str) -> str:
+    # Same text, same embedding: unify unicode forms and whitespace. Case is kept, the encoder is cased
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model_name: str, text: str) -> str:
+    return hashlib.sha256(f"{encoder_id(model_name)}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU cache (with optional TTL) of text -> embedding, keyed on a content hash of the
+    normalised text and the encoder (model and backend). Questionnaire resubmissions that only
+    change filters (location, credits, ...) reuse the cached vectors and skip the transformer.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, model_name: str, texts: list[str]) -> np.ndarray:
+        normalized = [normalize_text(text) for text in texts]
+        keys = [cache_key(model_name, text) for text in normalized]
+        vectors: list[np.ndarray | None] = [self._get(key) for key in keys]
+
+        # Encode all misses in one batch; duplicates within the call are encoded once
+        missing = list(dict.fromkeys(normalized[i] for i, v in enumerate(vectors) if v is None))
+        if missing:
+            model = registry.get(model_name)
+            encoded = model.encode(missing, batch_size=settings.encode_batch_size, show_progress_bar=False)
+            fresh = {}
+            for text, vector in zip(missing, np.asarray(encoded, dtype=np.float32)):
+                vector.flags.writeable = False
+                fresh[text] = vector
+                self._put(cache_key(model_name, text), vector)
+            vectors = [v if v is not None else fresh[normalized[i]] for i, v in enumerate(vectors)]
+
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack(vectors)
+
+    def _get(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds > 0 and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, key: str, vector: np.ndarray) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+embedding_cache = EmbeddingCache(settings.embedding_cache_size, settings.embedding_cache_ttl_seconds)
@@ -0,0 +1,199 @@
+import ast
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from services.catalogue import file_sha256
+from services.embedding_store import read_embeddings, write_binary_embeddings
+from services.model_registry import encoder_id, registry
+
+# pandas is imported where it is used, so importing the app stays fast (scripts/measure_import_time.py)
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Bump when module_texts() changes, so every module is re-encoded on the next build
+TEXT_VERSION = 1
+
+# Placeholder learning outcomes that are treated as missing (see notebook 2.2)
+PLACEHOLDER_OUTCOMES_CONTAINS = [
+    "ntb", "nog niet bekend", "nog te formuleren", "nog nader te bepalen", "nader te bepalen", "nog te bepalen", "n.n.b.",
+]
+PLACEHOLDER_OUTCOMES_EXACT = ["volgt", "nan"]
+
+SOFT_NLP_COLUMNS = ["name", "description", "learningoutcomes", "module_tags"]
+
+
+def soft_nlp(text):
+    # Soft NLP for SBERT: only trailing white space is removed (same as helpers/functs/NLP.py)
+    if not isinstance(text, str):
+        return text
+    return text.strip()
+
+
+def _normalize_location(value) -> list[str]:
+    import pandas as pd
+
+    if pd.isna(value):
+        return []
+    text = str(value).strip()
+    if text == "Breda en Den Bosch":
+        return ["Breda", "Den Bosch"]
+    if text == "Den Bosch en Tilburg":
+        return ["Den Bosch", "Tilburg"]
+    return [text]
+
+
+def _merge_description_content(row):
+    import pandas as pd
+
+    description, content = row["description"], row["content"]
+    if pd.isna(content) or description == content:
+        return description
+    return str(description) + " " + str(content)
+
+
+def clean_catalogue(raw_df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    The cleaning steps of notebook 2.2 with soft NLP instead of hard NLP. The result matches
+    data/cleaned/cleaned_dataset_soft-NLP.csv row for row.
+    """
+    df = raw_df.copy()
+    df = df.drop(columns=["shortdescription"])
+
+    # Content is appended to the description where they differ, then dropped
+    differs = df["content"] != df["description"]
+    df.loc[differs, "description"] = df.loc[differs].apply(_merge_description_content, axis=1)
+    df = df.drop(columns=["content"])
+
+    df["location"] = df["location"].apply(_normalize_location)
+
+    df["learningoutcomes"] = df["learningoutcomes"].str.lower()
+    for value in PLACEHOLDER_OUTCOMES_CONTAINS:
+        df.loc[df["learningoutcomes"].str.contains(re.escape(value), na=False), "learningoutcomes"] = np.nan
+    df.loc[df["learningoutcomes"].isin(PLACEHOLDER_OUTCOMES_EXACT), "learningoutcomes"] = np.nan
+
+    df = df.drop(columns=["Rood", "Groen", "Blauw", "Geel"])
+
+    # "['a', 'b']" -> "a b"; empty lists and ['ntb'] become missing
+    tags = df["module_tags"].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
+    tags = tags.apply(lambda x: np.nan if x == [] or x == ["ntb"] else x)
+    df["module_tags"] = tags.apply(lambda x: " ".join(x) if isinstance(x, list) else x)
+
+    df["popularity_score"] = df["popularity_score"] / 500
+
+    for col in SOFT_NLP_COLUMNS:
+        df[col] = df[col].apply(soft_nlp)
+    return df
+
+
+def module_texts(cleaned_df: "pd.DataFrame") -> dict[int, str]:
+    # Same text as notebook 6: name, description, learning outcomes and tags. The notebook lost the
+    # tags (they are a string in the CSV, not a list); here they are included
+    import pandas as pd
+
+    texts = {}
+    for row in cleaned_df.to_dict("records"):
+        parts = [row.get(col) for col in SOFT_NLP_COLUMNS]
+        texts[int(row["id"])] = " ".join(str(p) if p is not None and pd.notna(p) else "" for p in parts)
+    return texts
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def manifest_path_for(path: str) -> str:
+    return path[:-len(".npy")] + ".manifest.json"
+
+
+def read_manifest(path: str) -> dict | None:
+    try:
+        with open(manifest_path_for(path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _reusable_vectors(target: str, encoder: str) -> dict[int, tuple[str, np.ndarray]]:
+    # module id -> (text hash, vector) from the previous build, if it used the same encoder and texts
+    manifest = read_manifest(target)
+    if not manifest or manifest.get("encoder") != encoder or manifest.get("text_version") != TEXT_VERSION:
+        return {}
+    try:
+        ids, matrix = read_embeddings(target)
+    except (OSError, ValueError):
+        return {}
+    hashes = manifest.get("modules", {})
+    return {
+        int(module_id): (hashes[str(int(module_id))], matrix[row])
+        for row, module_id in enumerate(ids)
+        if str(int(module_id)) in hashes
+    }
+
+
+def build_module_embeddings(
+    raw_path: str,
+    target: str,
+    model_name: str,
+    backend: str | None = None,
+    batch_size: int = 256,
+    full: bool = False,
+    cleaned_output: str | None = None,
+) -> dict:
+    """
+    Raw catalogue -> soft NLP -> per-module text hash -> binary embedding store + manifest.
+    Only modules whose text (or the encoder) changed since the previous build are encoded;
+    all of them in one batched encode call. Returns the manifest that was written.
+    """
+    import pandas as pd
+
+    cleaned = clean_catalogue(pd.read_csv(raw_path, low_memory=False))
+    if cleaned_output:
+        cleaned.to_csv(cleaned_output, index=False)
+
+    texts = module_texts(cleaned)
+    hashes = {module_id: text_hash(text) for module_id, text in texts.items()}
+    encoder = encoder_id(model_name, backend)
+
+    previous = {} if full else _reusable_vectors(target, encoder)
+    changed = [module_id for module_id, h in hashes.items() if module_id not in previous or previous[module_id][0] != h]
+
+    encoded = {}
+    if changed:
+        model = registry.load(model_name, backend=backend)
+        vectors = model.encode([texts[m] for m in changed], batch_size=batch_size, show_progress_bar=len(changed) > batch_size)
+        encoded = dict(zip(changed, np.asarray(vectors, dtype=np.float32)))
+
+    ids = np.fromiter(hashes.keys(), dtype=np.int64, count=len(hashes))
+    matrix = np.stack([encoded[m] if m in encoded else previous[m][1] for m in hashes]).astype(np.float32)
+
+    # The old manifest goes first and the new one is written last: a build that dies halfway
+    # leaves no manifest, so the next build starts from scratch instead of trusting a stale matrix
+    if os.path.exists(manifest_path_for(target)):
+        os.remove(manifest_path_for(target))
+    write_binary_embeddings(target, ids, matrix)
+
+    manifest = {
+        "encoder": encoder,
+        "model": model_name,
+        "text_version": TEXT_VERSION,
+        "source": os.path.basename(raw_path),
+        "source_sha256": file_sha256(raw_path),
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "count": len(ids),
+        "dimension": int(matrix.shape[1]),
+        "encoded": len(changed),
+        "reused": len(ids) - len(changed),
+        "removed": len(set(previous) - set(hashes)),
+        "modules": {str(module_id): h for module_id, h in hashes.items()},
+    }
+    tmp_path = manifest_path_for(target) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path_for(target))
+    return manifest
@@ -0,0 +1,161 @@
+import ast
+import os
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from config import settings
+
+# pandas is imported where it is used, so importing the app stays fast (scripts/measure_import_time.py)
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def parse_embedding_vector(value) -> np.ndarray:
+    # Stored vectors can be real arrays/lists or stringified numpy arrays ("[0.1 0.2]" or "[0.1, 0.2]")
+    if isinstance(value, (list, np.ndarray)):
+        return np.asarray(value, dtype=np.float32)
+    if isinstance(value, str):
+        s = value.strip()
+        if s.startswith("[") and "," in s:
+            return np.asarray(ast.literal_eval(s), dtype=np.float32)
+        return np.fromstring(s.strip("[]"), sep=" ", dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    # Row-wise L2 normalisation so cosine similarity becomes a plain dot product
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+@dataclass(frozen=True)
+class EmbeddingSnapshot:
+    ids: np.ndarray
+    matrix: np.ndarray
+    row_of: dict[int, int]
+    version: str
+
+    def rows_for_ids(self, ids) -> np.ndarray:
+        # Matrix rows of the given module ids, in catalogue order. Unknown ids are skipped
+        return np.flatnonzero(np.isin(self.ids, np.fromiter(ids, dtype=np.int64)))
+
+
+def ids_path_for(path: str) -> str:
+    # Binary stores keep the module ids in a sidecar next to the matrix: x.npy -> x.ids.npy
+    return path[:-len(".npy")] + ".ids.npy"
+
+
+def write_binary_embeddings(path: str, ids: np.ndarray, matrix: np.ndarray, dtype: str = "float32") -> None:
+    # Both files are written to a temp name first and then renamed, so readers (and existing
+    # memory maps) never see a half-written file. The matrix goes last because its
+    # mtime is what triggers a reload.
+    matrix = l2_normalize(np.asarray(matrix, dtype=np.float32)).astype(dtype)
+    for target, array in ((ids_path_for(path), np.asarray(ids, dtype=np.int64)), (path, matrix)):
+        tmp_path = target + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp_path, target)
+
+
+def _file_version(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _read_binary(path: str) -> tuple[np.ndarray, np.ndarray]:
+    # Memory-mapped read-only: no parsing and no copy, and all workers on the host share
+    # the same page-cached file
+    matrix = np.load(path, mmap_mode="r")
+    ids = np.load(ids_path_for(path))
+
+    if matrix.dtype != np.float32:
+        # float16 stores trade the zero-copy load for half the disk size
+        matrix = matrix.astype(np.float32)
+
+    norms = np.linalg.norm(matrix, axis=1)
+    if not np.allclose(norms[norms > 0], 1.0, atol=1e-3):
+        matrix = l2_normalize(np.asarray(matrix, dtype=np.float32))
+    return ids.astype(np.int64), matrix
+
+
+def _read_dataframe(path: str) -> tuple[np.ndarray, np.ndarray]:
+    import pandas as pd
+
+    if path.endswith(".pkl"):
+        embedded_modules = pd.read_pickle(path)
+    else:
+        embedded_modules = pd.read_csv(path)
+
+    if "sentence_embedding_vector" not in embedded_modules.columns or "id" not in embedded_modules.columns:
+        raise KeyError(f"{path} must contain 'id' and 'sentence_embedding_vector' columns.")
+
+    ids = embedded_modules["id"].astype(np.int64).to_numpy()
+    vectors = [parse_embedding_vector(v) for v in embedded_modules["sentence_embedding_vector"]]
+    return ids, l2_normalize(np.stack(vectors).astype(np.float32))
+
+
+def read_embeddings(path: str) -> tuple[np.ndarray, np.ndarray]:
+    # Returns (ids, L2-normalised float32 matrix) for a binary (.npy) or legacy (.pkl/.csv) store
+    if path.endswith(".npy"):
+        return _read_binary(path)
+    return _read_dataframe(path)
+
+
+def _read_snapshot(path: str) -> EmbeddingSnapshot:
+    version = _file_version(path)
+    ids, matrix = read_embeddings(path)
+
+    if not isinstance(matrix, np.memmap):
+        matrix = np.ascontiguousarray(matrix)
+        matrix.flags.writeable = False
+
+    return EmbeddingSnapshot(
+        ids=ids,
+        matrix=matrix,
+        row_of={int(module_id): row for row, module_id in enumerate(ids)},
+        version=version,
+    )
+
+
+class EmbeddingStore:
+    """
+    Keeps the module embeddings in memory as one contiguous, L2-normalised float32 matrix.
+    The file is parsed once; when it changes on disk a new snapshot is built and swapped in
+    atomically, so requests always see either the old or the new matrix, never a mix.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._snapshot: EmbeddingSnapshot | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> EmbeddingSnapshot:
+        with self._lock:
+            self._snapshot = _read_snapshot(self.path)
+            return self._snapshot
+
+    def get(self) -> EmbeddingSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.load()
+
+        try:
+            changed = _file_version(self.path) != snapshot.version
+        except OSError:
+            # File is being replaced; keep serving the current snapshot
+            return snapshot
+
+        if changed:
+            with self._lock:
+                # Only one thread rebuilds, the others pick up its result
+                if self._snapshot is snapshot:
+                    self._snapshot = _read_snapshot(self.path)
+                return self._snapshot
+        return snapshot
+
+
+embedding_store = EmbeddingStore(settings.embeddings_path)
@@ -0,0 +1,158 @@
+import threading
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from config import settings
+from models.student_input import ALLOWED_LEVELS, ALLOWED_LOCATIONS, ALLOWED_PERIODS, StudentInput
+from services.catalogue import MONTH_PERIODS, catalogue_digest, load_catalogue, parse_locations
+from services.embedding_store import EmbeddingSnapshot
+
+# pandas is imported where it is used, so importing the app stays fast (scripts/measure_import_time.py)
+if TYPE_CHECKING:
+    import pandas as pd
+
+PERIODS = sorted(ALLOWED_PERIODS)
+PERIOD_BITS = {period: 1 << i for i, period in enumerate(PERIODS)}
+
+LANGUAGE_COLUMNS = ("language", "taal", "preferred_language")
+PERIOD_COLUMNS = ("period", "periode", "preferred_period")
+
+
+def month_to_period(month: np.ndarray) -> np.ndarray:
+    # Dutch school year quarters (school year starts in September)
+    # P1: Sep–Nov, P2: Dec–Feb, P3: Mar–May, P4: Jun–Aug. Unknown months get no period.
+    lookup = np.zeros(13, dtype=np.uint8)
+    for m, period in MONTH_PERIODS.items():
+        lookup[m] = PERIOD_BITS[period]
+    month = np.nan_to_num(month, nan=0).astype(np.int64)
+    return lookup[month]
+
+
+class FilterIndex:
+    """
+    Columnar view of the module metadata for the hard filters. All parsing (locations,
+    periods, levels) happens once here, so a StudentInput becomes a handful of vectorised
+    comparisons over NumPy arrays. A column that is missing from the metadata is stored
+    as None and its filter is skipped, like before.
+    """
+
+    def __init__(self, metadata_df: "pd.DataFrame"):
+        import pandas as pd
+
+        self.ids = metadata_df["id"].astype(np.int64).to_numpy()
+
+        self.level_vocab: dict[str, int] = {}
+        self.level_codes = None
+        if "level" in metadata_df.columns:
+            levels = metadata_df["level"].astype(object).where(metadata_df["level"].notna(), None)
+            for level in sorted(ALLOWED_LEVELS) + sorted({l for l in levels if l is not None}):
+                self.level_vocab.setdefault(level, len(self.level_vocab))
+            self.level_codes = np.array([self.level_vocab.get(l, -1) for l in levels], dtype=np.int16)
+
+        self.credits = None
+        if "studycredit" in metadata_df.columns:
+            self.credits = metadata_df["studycredit"].to_numpy(dtype=np.float64)
+
+        self.location_bits: dict[str, int] = {}
+        self.location_masks = None
+        if "location" in metadata_df.columns:
+            locations = [parse_locations(v) for v in metadata_df["location"]]
+            known = sorted(ALLOWED_LOCATIONS) + sorted({loc for locs in locations for loc in locs})
+            for loc in known:
+                self.location_bits.setdefault(loc, 1 << len(self.location_bits))
+            if len(self.location_bits) > 64:
+                raise ValueError("FilterIndex supports at most 64 distinct locations")
+            self.location_masks = np.array(
+                [sum({self.location_bits[loc] for loc in locs}) for locs in locations], dtype=np.uint64
+            )
+
+        self.languages = None
+        for candidate_col in LANGUAGE_COLUMNS:
+            if candidate_col in metadata_df.columns:
+                self.languages = metadata_df[candidate_col].astype(object).to_numpy()
+                break
+
+        # Period bitmask: from a dedicated period column if present, otherwise derived from start_date
+        self.period_masks = None
+        for candidate_col in PERIOD_COLUMNS:
+            if candidate_col in metadata_df.columns:
+                self.period_masks = np.array(
+                    [PERIOD_BITS.get(p, 0) for p in metadata_df[candidate_col]], dtype=np.uint8
+                )
+                break
+        else:
+            if "start_date" in metadata_df.columns:
+                start_dates = pd.to_datetime(metadata_df["start_date"], errors="coerce")
+                self.period_masks = month_to_period(start_dates.dt.month.to_numpy(dtype=np.float64))
+
+        self._aligned: tuple[str, np.ndarray] | None = None
+
+    @classmethod
+    def from_csv(cls, metadata_path: str) -> "FilterIndex":
+        # The catalogue loader already parsed the locations and derived the period column
+        return cls(load_catalogue(metadata_path, settings.catalogue_cache_dir))
+
+    def mask(self, data: StudentInput) -> np.ndarray:
+        mask = np.ones(len(self.ids), dtype=bool)
+
+        level_preference = getattr(data, "level_preference", None)
+        if level_preference and self.level_codes is not None:
+            wanted = [self.level_vocab[l] for l in level_preference if l in self.level_vocab]
+            mask &= np.isin(self.level_codes, wanted)
+
+        if self.credits is not None:
+            min_credits, max_credits = data.wanted_study_credit_range
+            mask &= (self.credits >= min_credits) & (self.credits <= max_credits)
+
+        location_preference = getattr(data, "location_preference", None)
+        if location_preference and self.location_masks is not None:
+            wanted = sum({self.location_bits[loc] for loc in location_preference if loc in self.location_bits})
+            mask &= (self.location_masks & np.uint64(wanted)) != 0
+
+        # Skipped when the metadata has no language column yet
+        preferred_language = getattr(data, "preferred_language", None)
+        if preferred_language and preferred_language != "Niet van toepassing" and self.languages is not None:
+            mask &= self.languages == preferred_language
+
+        preferred_periods = getattr(data, "preferred_period", None)
+        if preferred_periods and self.period_masks is not None:
+            wanted = sum({PERIOD_BITS[p] for p in preferred_periods if p in PERIOD_BITS})
+            mask &= (self.period_masks & np.uint8(wanted)) != 0
+
+        return mask
+
+    def candidate_ids(self, data: StudentInput) -> np.ndarray:
+        return self.ids[self.mask(data)]
+
+    def candidate_rows(self, data: StudentInput, snapshot: EmbeddingSnapshot) -> np.ndarray:
+        # Embedding-matrix rows of the modules that pass the filters, in catalogue order
+        rows = self._embedding_rows(snapshot)[self.mask(data)]
+        return np.sort(rows[rows >= 0])
+
+    def _embedding_rows(self, snapshot: EmbeddingSnapshot) -> np.ndarray:
+        # Metadata row -> embedding row (-1 when the module has no embedding), rebuilt per snapshot
+        aligned = self._aligned
+        if aligned is None or aligned[0] != snapshot.version:
+            rows = np.array([snapshot.row_of.get(int(module_id), -1) for module_id in self.ids], dtype=np.int64)
+            aligned = (snapshot.version, rows)
+            self._aligned = aligned
+        return aligned[1]
+
+
+_indexes: dict[str, tuple[str, FilterIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_filter_index(metadata_path: str = settings.metadata_path) -> FilterIndex:
+    # One index per metadata file, built on first use (or at startup from the lifespan) and
+    # rebuilt when the file's content changes
+    digest = catalogue_digest(metadata_path)
+    entry = _indexes.get(metadata_path)
+    if entry is None or entry[0] != digest:
+        with _indexes_lock:
+            entry = _indexes.get(metadata_path)
+            if entry is None or entry[0] != digest:
+                entry = (digest, FilterIndex.from_csv(metadata_path))
+                _indexes[metadata_path] = entry
+    return entry[1]
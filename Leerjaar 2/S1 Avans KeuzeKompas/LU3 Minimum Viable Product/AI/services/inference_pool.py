@@ -0,0 +1,155 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from config import settings
+from services.embedding_cache import embedding_cache
+
+
+class Overloaded(Exception):
+    """Raised when the inference pipeline has no room for another request."""
+
+
+class AdmissionControl:
+    """
+    Caps the number of requests inside the inference pipeline. Everything beyond the cap is
+    rejected straight away (503 + Retry-After) instead of queueing until the client times out.
+    Only used from the event loop, so a plain counter is enough.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.rejected = 0
+
+    @contextmanager
+    def admit(self):
+        if self.in_flight >= self.limit:
+            self.rejected += 1
+            raise Overloaded(f"{self.in_flight} requests in progress (limit {self.limit})")
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+
+class EncoderBatcher:
+    """
+    Coalesces concurrent encode calls into micro-batches. The first request waits at most
+    microbatch_window_ms for others to join, then all texts go through the encoder in one call
+    on a dedicated, bounded executor, so torch never runs on the event loop or Starlette's pool.
+    """
+
+    def __init__(self, window_ms: float, max_texts: int, workers: int):
+        self.window = window_ms / 1000
+        self.max_texts = max_texts
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="encoder")
+        self._loop = None
+        self._queue: asyncio.Queue | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._collector: asyncio.Task | None = None
+        self.batches = 0
+        self.texts = 0
+
+    async def encode(self, texts: list[str]):
+        self._ensure_collector()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((texts, future))
+        return await future
+
+    def _ensure_collector(self):
+        # Bound to the running loop; (re)started lazily, e.g. for every TestClient context
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._collector is None or self._collector.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.workers)
+            self._collector = loop.create_task(self._collect())
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            n_texts = len(pending[0][0])
+            deadline = loop.time() + self.window
+            while n_texts < self.max_texts:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                n_texts += len(item[0])
+
+            # Wait for a free encoder thread, then keep collecting while this batch runs
+            await self._slots.acquire()
+            loop.create_task(self._encode_batch(pending))
+
+    async def _encode_batch(self, pending):
+        try:
+            pending = [(texts, future) for texts, future in pending if not future.done()]
+            if not pending:
+                return
+            texts = [text for item_texts, _ in pending for text in item_texts]
+            self.batches += 1
+            self.texts += len(texts)
+            try:
+                vectors = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, embedding_cache.encode, settings.encoder_model, texts,
+                )
+            except Exception as exc:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                return
+
+            offset = 0
+            for item_texts, future in pending:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+        finally:
+            self._slots.release()
+
+    async def stop(self):
+        if self._collector is not None and not self._collector.done():
+            self._collector.cancel()
+        self._collector = None
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "mean_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+encoder_batcher = EncoderBatcher(
+    settings.microbatch_window_ms, settings.microbatch_max_texts, settings.encoder_workers,
+)
+
+# Filtering, ranking and the motivations (NumPy) run here, off the event loop
+pipeline_executor = ThreadPoolExecutor(max_workers=settings.pipeline_workers, thread_name_prefix="pipeline")
+
+admission = AdmissionControl(settings.max_pending_requests)
+
+
+async def run_in_pipeline(func, *args):
+    # run_in_executor does not carry contextvars over; copy them so stage timings reach the request
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(pipeline_executor, context.run, func, *args)
+
+
+def inference_stats() -> dict:
+    return {
+        **encoder_batcher.stats(),
+        "in_flight": admission.in_flight,
+        "max_pending_requests": admission.limit,
+        "rejected": admission.rejected,
+    }
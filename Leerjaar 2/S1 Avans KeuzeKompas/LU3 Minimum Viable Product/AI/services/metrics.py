@@ -0,0 +1,122 @@
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Latency buckets in seconds, from sub-millisecond NumPy stages up to a cold encoder
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Stage timings of the current request, set by the middleware in main.py (None outside a request)
+_request_timings: ContextVar[list | None] = ContextVar("request_timings", default=None)
+_request_started: ContextVar[float | None] = ContextVar("request_started", default=None)
+# Set while the warm-up runs its dummy inference, which should not show up in the histograms
+_muted: ContextVar[bool] = ContextVar("metrics_muted", default=False)
+
+
+class Histogram:
+    """
+    Minimal Prometheus histogram with one label, rendered in the text exposition format.
+    Kept dependency-free; swap for prometheus_client if more metric types are ever needed.
+    """
+
+    def __init__(self, name: str, documentation: str, label: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._series: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, seconds: float) -> None:
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), then the sum of all observations
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect.bisect_left(self.buckets, seconds)] += 1
+            series[1] += seconds
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_value, (counts, total) in sorted(self._series.items()):
+                labels = f'{self.label}="{label_value}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{self.name}_sum{{{labels}}} {total}")
+                lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+stage_duration = Histogram(
+    "keuzekompas_stage_duration_seconds", "Time spent in each recommender stage.", "stage",
+)
+request_duration = Histogram(
+    "keuzekompas_request_duration_seconds", "End-to-end request latency per endpoint.", "endpoint",
+)
+
+
+@contextmanager
+def stage(name: str):
+    # Times the block into the stage histogram and, inside a request, into its Server-Timing list
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        if not _muted.get():
+            stage_duration.observe(name, seconds)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((name, seconds))
+
+
+def timed(name: str):
+    # Decorator form of stage()
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def muted():
+    # Stages inside this block are not recorded
+    token = _muted.set(True)
+    try:
+        yield
+    finally:
+        _muted.reset(token)
+
+
+def start_request() -> list:
+    # Fresh timing list for this request; executors see it through the copied context
+    timings = []
+    _request_timings.set(timings)
+    _request_started.set(time.perf_counter())
+    return timings
+
+
+def request_started() -> float | None:
+    # perf_counter() at the start of the current request, None outside a request
+    return _request_started.get()
+
+
+def server_timing_header(timings: list) -> str:
+    # Repeated stages (e.g. per student in a batch) are summed; durations in milliseconds
+    totals: dict[str, float] = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in totals.items())
+
+
+def render_metrics() -> str:
+    return "\n".join(stage_duration.render() + request_duration.render()) + "\n"
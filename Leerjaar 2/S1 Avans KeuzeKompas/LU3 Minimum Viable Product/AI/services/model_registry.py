@@ -0,0 +1,237 @@
+import hashlib
+import os
+import resource
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from config import settings
+
+# torch and sentence-transformers take seconds to import, so they are only imported when a
+# model is actually loaded: importing the app (and answering /health) does not wait for them
+if TYPE_CHECKING:
+    from sentence_transformers import CrossEncoder, SentenceTransformer
+
+
+def get_device() -> str:
+    import torch
+
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+
+def _current_rss_bytes() -> int:
+    # Current resident set size. /proc is Linux only, so fall back to the peak RSS elsewhere
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _parameter_bytes(model) -> int:
+    # Size of the weights and buffers held by the model itself (a CrossEncoder wraps its module)
+    model = model if hasattr(model, "parameters") else model.model
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def _model_source(name: str) -> tuple[str, bool]:
+    # A local model directory (see scripts/export_encoder.py) is always loaded offline;
+    # otherwise the Hugging Face name is used, offline from the local cache if configured
+    if settings.encoder_model_dir:
+        return settings.encoder_model_dir, True
+    return name, settings.encoder_offline
+
+
+def _load_torch(source: str, device: str | None, local_files_only: bool) -> "SentenceTransformer":
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(source, device=device or get_device(), local_files_only=local_files_only)
+
+
+def _load_torch_int8(source: str, device: str | None, local_files_only: bool) -> "SentenceTransformer":
+    # Dynamic int8 quantisation of every Linear layer; weights are quantised once, activations per call.
+    # Quantised kernels only exist on CPU
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(source, device="cpu", local_files_only=local_files_only)
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def _load_onnx(source: str, device: str | None, local_files_only: bool) -> "SentenceTransformer":
+    # ONNX Runtime through sentence-transformers; exported on the fly when the directory has no .onnx file
+    from sentence_transformers import SentenceTransformer
+
+    model_kwargs = {"file_name": settings.encoder_onnx_file} if settings.encoder_onnx_file else None
+    return SentenceTransformer(
+        source, device=device or get_device(), backend="onnx", model_kwargs=model_kwargs,
+        local_files_only=local_files_only,
+    )
+
+
+class StubEncoder:
+    """
+    Deterministic stand-in for a SentenceTransformer: every text maps to a fixed pseudo-random
+    unit vector seeded by its hash. No download and no torch inference, for benchmarks and
+    load tests; the rankings it produces are meaningless.
+    """
+
+    device = "cpu"
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def encode(self, texts, batch_size: int = 32, show_progress_bar: bool = False, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+            vectors[i] = np.random.default_rng(seed).standard_normal(self.dimension, dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors[0] if single else vectors
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def eval(self):
+        return self
+
+    def parameters(self):
+        return []
+
+    def buffers(self):
+        return []
+
+
+class StubCrossEncoder:
+    """Deterministic stand-in for a CrossEncoder: a pseudo-random score per (query, text) pair."""
+
+    device = "cpu"
+
+    def predict(self, pairs, batch_size: int = 32, show_progress_bar: bool = False, **kwargs):
+        scores = np.zeros(len(pairs), dtype=np.float32)
+        for i, (query, text) in enumerate(pairs):
+            digest = hashlib.blake2b(f"{query}\0{text}".encode("utf-8"), digest_size=8).digest()
+            scores[i] = int.from_bytes(digest, "little") / 2 ** 64
+        return scores
+
+    def parameters(self):
+        return []
+
+    def buffers(self):
+        return []
+
+
+def _load_cross_encoder(name: str, device: str | None, local_files_only: bool) -> "CrossEncoder":
+    if name == "stub":
+        return StubCrossEncoder()
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(
+        name, device=device or get_device(), max_length=settings.rerank_max_length, local_files_only=local_files_only,
+    )
+
+
+# Encoder backends, selected with KEUZEKOMPAS_ENCODER_BACKEND
+ENCODER_BACKENDS = {
+    "torch": _load_torch,
+    "torch-int8": _load_torch_int8,
+    "onnx": _load_onnx,
+    "stub": lambda source, device, local_files_only: StubEncoder(),
+}
+
+
+def encoder_id(name: str, backend: str | None = None) -> str:
+    # Backends produce (slightly) different vectors, so caches are keyed on model and backend
+    return f"{name}@{backend or settings.encoder_backend}"
+
+
+class ModelRegistry:
+    """
+    Process-wide registry that loads every (model, backend) pair only once.
+    Models are put in eval mode and only used for inference, so a single instance
+    can be shared by all worker threads; the lock only guards loading.
+    """
+
+    def __init__(self):
+        self._models: dict[str, "SentenceTransformer"] = {}
+        self._stats: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self, name: str, device: str | None = None, backend: str | None = None) -> "SentenceTransformer":
+        key = encoder_id(name, backend)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have finished loading while we were waiting
+            model = self._models.get(key)
+            if model is not None:
+                return model
+
+            backend = backend or settings.encoder_backend
+            if backend not in ENCODER_BACKENDS:
+                raise ValueError(f"Unknown encoder backend '{backend}'. Options: {', '.join(ENCODER_BACKENDS)}")
+
+            source, local_files_only = _model_source(name)
+
+            def load_encoder():
+                model = ENCODER_BACKENDS[backend](source, device, local_files_only)
+                model.eval()
+                return model
+
+            return self._measure_load(key, backend, source, load_encoder)
+
+    def load_cross_encoder(self, name: str, device: str | None = None) -> "CrossEncoder":
+        # Re-ranking model (see services/reranker.py), registered next to the encoders
+        key = f"{name}@cross-encoder"
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                return model
+            return self._measure_load(
+                key, "cross-encoder", name,
+                lambda: _load_cross_encoder(name, device, settings.encoder_offline),
+            )
+
+    def _measure_load(self, key: str, backend: str, source: str, load):
+        # Loads under the caller's lock and records load time and memory footprint
+        rss_before = _current_rss_bytes()
+        started = time.perf_counter()
+        model = load()
+        load_seconds = time.perf_counter() - started
+        self._stats[key] = {
+            "backend": backend,
+            "source": source,
+            "device": str(model.device),
+            "load_seconds": round(load_seconds, 3),
+            "parameter_bytes": _parameter_bytes(model),
+            "rss_delta_bytes": max(_current_rss_bytes() - rss_before, 0),
+        }
+        self._models[key] = model
+        return model
+
+    def get(self, name: str, backend: str | None = None) -> "SentenceTransformer":
+        # Falls back to lazy loading so scripts and tests work without the app lifespan
+        return self._models.get(encoder_id(name, backend)) or self.load(name, backend=backend)
+
+    def is_loaded(self, name: str, backend: str | None = None) -> bool:
+        return encoder_id(name, backend) in self._models
+
+    def stats(self) -> dict:
+        return {
+            "models": {name: dict(stats) for name, stats in self._stats.items()},
+            "process_rss_bytes": _current_rss_bytes(),
+        }
+
+
+registry = ModelRegistry()
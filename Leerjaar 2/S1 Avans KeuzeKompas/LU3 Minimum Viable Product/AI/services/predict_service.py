@@ -1,26 +1,142 @@
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
 from models.student_input import StudentInput
-import pandas as pd
+from services.embedding_cache import embedding_cache
+from services.embedding_store import embedding_store, l2_normalize
+from services.filter_index import get_filter_index
+from services.description_store import get_description_store
+from services.ann_index import ExactIndex, get_ann_index
+from services.bm25_index import fuse_scores, get_bm25_index, query_terms
+from services.topk import top_k_indices
+from services.inference_pool import admission, encoder_batcher, run_in_pipeline
+from services.metrics import stage, timed
+from services.response_cache import catalogue_version, input_hash, response_cache, template_rng
+from services.ranking_cache import CatalogueRanking, decode_cursor, encode_cursor, ranking_cache
+from services.reranker import get_module_texts, get_reranker, rerank_deadline
+from config import settings
 import numpy as np
-import json
-import ast
-import hashlib
-import random
 import re
-
-import torch
+import time
 
 def get_top_5_prediction(
     data: StudentInput,
-    metadata_path: str = "data/cleaned/cleaned_dataset_soft-NLP.csv",
+    metadata_path: str = settings.metadata_path,
 ):
+    key, version, cached = lookup_response(data, metadata_path)
+    if cached is not None:
+        return cached
+
     combined_student_input = combine_student_input(data)
     vectorized_student_input = vectorize_student_input(combined_student_input)
     top_5 = filter_matches_top_5(vectorized_student_input, data, metadata_path=metadata_path)
-    return add_motivation(vectorized_student_input, top_5, data, metadata_path=metadata_path)
+    result = add_motivation(vectorized_student_input, top_5, data, metadata_path=metadata_path, rng=template_rng(data, key))
+    response_cache.put(key, version, result)
+    return result
+
+def current_catalogue(metadata_path: str = settings.metadata_path):
+    # Embedding snapshot and catalogue version. Stats the store and metadata files (and reloads
+    # the store when it changed), so the async paths call it through run_in_pipeline
+    snapshot = embedding_store.get()
+    return snapshot, catalogue_version(snapshot, metadata_path)
+
+def lookup_response(
+    data: StudentInput,
+    metadata_path: str = settings.metadata_path,
+):
+    # Canonical input hash and catalogue version of a request, plus its cached response (or None)
+    return lookup_responses([data], metadata_path)[0]
+
+def lookup_responses(
+    batch: list[StudentInput],
+    metadata_path: str = settings.metadata_path,
+):
+    # lookup_response for a whole batch, with one catalogue version for all of it
+    _, version = current_catalogue(metadata_path)
+    keys = [input_hash(data) for data in batch]
+    return [(key, version, response_cache.get(key, version)) for key in keys]
+
+async def get_top_5_prediction_async(
+    data: StudentInput,
+    metadata_path: str = settings.metadata_path,
+):
+    """
+    Non-blocking variant of get_top_5_prediction. The combined input and the motivation chunks
+    are encoded together through the micro-batcher (shared with concurrent requests); filtering,
+    ranking and the motivations run on the pipeline executor. Raises Overloaded when full.
+    Cached responses are returned before admission, so they never take up an inference slot.
+    """
+    key, version, cached = await run_in_pipeline(lookup_response, data, metadata_path)
+    if cached is not None:
+        return cached
+
+    with admission.admit():
+        texts = [combine_student_input(data)] + [chunk["text"] for chunk in split_student_chunks(data)]
+        with stage("vectorize"):
+            vectors = await encoder_batcher.encode(texts)
+        result = await run_in_pipeline(predict_from_vectors, data, vectors[0], vectors[1:], metadata_path, key)
+    response_cache.put(key, version, result)
+    return result
+
+async def stream_top_5_prediction(
+    data: StudentInput,
+    metadata_path: str = settings.metadata_path,
+):
+    """
+    Streaming variant of get_top_5_prediction_async, as an async generator of events. Only the
+    combined input is encoded before retrieval, so the ranking event costs one short encode plus
+    the search; the motivation chunks are encoded afterwards and every module's motivation follows
+    as its own event. The admission slot is held until the generator is exhausted or closed.
+    A cached response is replayed as the same events; a completed stream is cached.
+    """
+    key, version, cached = await run_in_pipeline(lookup_response, data, metadata_path)
+    if cached is not None:
+        yield {
+            "event": "ranking",
+            "filtered_top_5_matches": [{k: v for k, v in module.items() if k != "motivation"} for module in cached],
+        }
+        for module in cached:
+            yield {"event": "motivation", "id": module["id"], "motivation": module["motivation"]}
+        yield {"event": "done"}
+        return
+
+    with admission.admit():
+        with stage("vectorize"):
+            student_vector = (await encoder_batcher.encode([combine_student_input(data)]))[0]
+        top_5 = await run_in_pipeline(filter_matches_top_5, student_vector, data, metadata_path)
+        yield {"event": "ranking", "filtered_top_5_matches": top_5}
+
+        result = []
+        if top_5:
+            chunk_texts = [chunk["text"] for chunk in split_student_chunks(data)]
+            with stage("vectorize"):
+                chunk_vectors = await encoder_batcher.encode(chunk_texts) if chunk_texts else None
+            motivations = iter_motivations(
+                student_vector, top_5, data, metadata_path=metadata_path, chunk_vectors=chunk_vectors,
+                rng=template_rng(data, key),
+            )
+            while True:
+                with stage("motivation"):
+                    module = await run_in_pipeline(next, motivations, None)
+                if module is None:
+                    break
+                result.append(module)
+                yield {"event": "motivation", "id": module["id"], "motivation": module["motivation"]}
+
+        response_cache.put(key, version, result)
+        yield {"event": "done"}
+
+def predict_from_vectors(
+    data: StudentInput,
+    student_vector,
+    chunk_vectors,
+    metadata_path: str = settings.metadata_path,
+    key: str | None = None,
+):
+    top_5 = filter_matches_top_5(student_vector, data, metadata_path=metadata_path)
+    return add_motivation(
+        student_vector, top_5, data, metadata_path=metadata_path, chunk_vectors=chunk_vectors, rng=template_rng(data, key),
+    )
     
 
+@timed("combine")
 def combine_student_input(data: StudentInput):
     big_string = ". ".join([
         data.current_study,
@@ -29,187 +145,284 @@ def combine_student_input(data: StudentInput):
     ])
     return big_string.strip()
 
+@timed("vectorize")
 def vectorize_student_input(input: str):
-    model = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
-    device = 'cuda' if torch.cuda.is_available() else 'cpu'
-    vectorized_student_input = model.encode(input, show_progress_bar=True, device=device)
+    # Shared encoder behind the text -> embedding cache
+    vectorized_student_input = embedding_cache.encode(settings.encoder_model, [input])[0]
     return vectorized_student_input
 
+def normalize_query(vectorized_student_input):
+    query = np.asarray(vectorized_student_input, dtype=np.float32).reshape(-1)
+    return l2_normalize(query)
+
 def ordered_module_matches(vectorized_student_input):
-    # Loading previously saved sentence embedded dataframe
-    embedded_modules = pd.read_pickle('data/processed/sentence_embedded_dataframe.pkl')
-    
-    # Converting stringified numpy arrays back to actual numpy arrays
-    embedded_modules["sentence_embedding_vector"] = embedded_modules["sentence_embedding_vector"].apply(
-        lambda x: (
-            np.asarray(x, dtype=float)
-            if isinstance(x, (list, np.ndarray))
-            else (
-                np.asarray(ast.literal_eval(x), dtype=float)
-                if isinstance(x, str) and x.strip().startswith("[") and "," in x
-                else (np.fromstring(x.strip("[]"), sep=" ", dtype=float) if isinstance(x, str) else np.asarray(x, dtype=float))
-            )
-        )
-    )
+    # Module matrix is kept in memory, L2-normalised, by the embedding store
+    snapshot = embedding_store.get()
+    ranking = rank_catalogue(snapshot, vectorized_student_input)
+    return matches_to_records(snapshot, ranking.rows, ranking.scores)
 
-    # Stacking individual vectors into a 2D matrix
-    module_matrix = np.stack(embedded_modules["sentence_embedding_vector"].values)
+def rank_catalogue(
+    snapshot,
+    vectorized_student_input,
+    candidate_rows=None,
+):
+    # The whole catalogue (or the given rows) ordered by cosine similarity, best first
+    if candidate_rows is None:
+        candidate_rows = np.arange(len(snapshot.ids))
+    with stage("similarity"):
+        scores = ExactIndex(snapshot.matrix).scores(normalize_query(vectorized_student_input), candidate_rows)
+        order = top_k_indices(scores, len(scores))
+    return CatalogueRanking(rows=candidate_rows[order].astype(np.int32), scores=scores[order].astype(np.float32))
 
-    scores = cosine_similarity(np.asarray(vectorized_student_input).reshape(1, -1), module_matrix)[0]
+def rank_filtered_catalogue(
+    snapshot,
+    vectorized_student_input,
+    data: StudentInput,
+    metadata_path: str = settings.metadata_path,
+):
+    # Hard filters first, then only the modules that pass them in ranked order
+    with stage("filter"):
+        candidate_rows = get_filter_index(metadata_path).candidate_rows(data, snapshot)
+    return rank_catalogue(snapshot, vectorized_student_input, candidate_rows)
 
-    # Adding score to dataframe
-    embedded_modules['similarity_score'] = scores
+async def ranked_catalogue_page_async(
+    data: StudentInput,
+    cursor: str | None = None,
+    limit: int = 20,
+    filtered: bool = False,
+    metadata_path: str = settings.metadata_path,
+):
+    """
+    One page of the catalogue ranked by fit for this input ("browse all modules"). The first page
+    encodes the input and orders the whole catalogue (or, with filtered, the modules that pass the
+    hard filters) once; that order is cached per input, so every next page is a slice of it.
+    Raises InvalidCursor for a cursor of another input and StaleCursor when the catalogue changed.
+    """
+    key = f"{input_hash(data)}:{'filtered' if filtered else 'all'}"
+    snapshot, version = await run_in_pipeline(current_catalogue, metadata_path)
+    offset = decode_cursor(cursor, key, version) if cursor else 0
 
-    # Dropping vector column before returning
-    embedded_modules = embedded_modules.drop(columns=['sentence_embedding_vector'])
+    ranking = ranking_cache.get(key, version)
+    if ranking is None:
+        with admission.admit():
+            with stage("vectorize"):
+                student_vector = (await encoder_batcher.encode([combine_student_input(data)]))[0]
+            # Filtering reads the metadata index, so it runs on the pipeline next to the scoring
+            if filtered:
+                ranking = await run_in_pipeline(rank_filtered_catalogue, snapshot, student_vector, data, metadata_path)
+            else:
+                ranking = await run_in_pipeline(rank_catalogue, snapshot, student_vector)
+        ranking_cache.put(key, version, ranking)
 
-    ordered_matches = embedded_modules.sort_values(by='similarity_score', ascending=False)
-    return json.loads(ordered_matches.to_json(orient="records"))
+    end = min(offset + limit, len(ranking.rows))
+    modules = matches_to_records(snapshot, ranking.rows[offset:end], ranking.scores[offset:end])
+    for rank, module in enumerate(modules, start=offset + 1):
+        module["rank"] = rank
+    return {
+        "modules": modules,
+        "total": int(len(ranking.rows)),
+        "next_cursor": encode_cursor(key, version, end) if end < len(ranking.rows) else None,
+    }
 
 def filter_matches_top_5(
     vectorized_student_input,
     data: StudentInput,
-    metadata_path: str = "data/cleaned/cleaned_dataset_soft-NLP.csv",
+    metadata_path: str = settings.metadata_path,
 ):
-    metadata_df = pd.read_csv(metadata_path)
-
-    # Ensure join keys have compatible dtypes
-    metadata_df["id"] = metadata_df["id"].astype(int)
-
-    # Apply level filter
-    if getattr(data, "level_preference", None) and "level" in metadata_df.columns:
-        metadata_df = metadata_df[metadata_df["level"].isin(data.level_preference)]
-
-    # Apply study credit range filter
-    min_credits, max_credits = data.wanted_study_credit_range
-    if "studycredit" in metadata_df.columns:
-        metadata_df = metadata_df[(metadata_df["studycredit"] >= min_credits) & (metadata_df["studycredit"] <= max_credits)]
-
-    # Apply location filter (metadata stores a string like "['Den Bosch']" in cleaned CSV)
-    if getattr(data, "location_preference", None) and "location" in metadata_df.columns:
-        preferred_locations = set(data.location_preference)
-
-        def normalize_locations(value):
-            if isinstance(value, list):
-                return value
-            if isinstance(value, str):
-                s = value.strip()
-                if s.startswith("[") and s.endswith("]"):
-                    try:
-                        parsed = ast.literal_eval(s)
-                        if isinstance(parsed, list):
-                            return parsed
-                    except (ValueError, SyntaxError):
-                        pass
-                return [s]
-            if pd.isna(value):
-                return []
-            return [str(value)]
-
-        metadata_df["_locations"] = metadata_df["location"].apply(normalize_locations)
-        metadata_df = metadata_df[metadata_df["_locations"].apply(lambda locs: any(loc in preferred_locations for loc in locs))]
-        metadata_df = metadata_df.drop(columns=["_locations"])
-
-    # Apply preferred language filter only if the metadata contains a language column.
-    # If your datasets don't have this column yet, this filter is skipped.
-    preferred_language = getattr(data, "preferred_language", None)
-    if preferred_language and preferred_language != "Niet van toepassing":
-        for candidate_col in ("language", "taal", "preferred_language"):
-            if candidate_col in metadata_df.columns:
-                metadata_df = metadata_df[metadata_df[candidate_col] == preferred_language]
-                break
-
-    # Apply preferred period filter.
-    # If the metadata contains a dedicated period column, use it.
-    # Otherwise, derive the period from the start_date column.
-    preferred_periods = getattr(data, "preferred_period", None)
-    if preferred_periods:
-        preferred_periods = set(preferred_periods)
-
-        # 1) Direct period column in dataset
-        for candidate_col in ("period", "periode", "preferred_period"):
-            if candidate_col in metadata_df.columns:
-                metadata_df = metadata_df[metadata_df[candidate_col].isin(preferred_periods)]
-                break
-        else:
-            # 2) Derive from start_date
-            if "start_date" in metadata_df.columns:
-                def date_to_period(dt: pd.Timestamp | None):
-                    if dt is None or pd.isna(dt):
-                        return None
-                    month = int(dt.month)
-                    # Dutch school year quarters (school year starts in September)
-                    # P1: Sep–Nov, P2: Dec–Feb, P3: Mar–May, P4: Jun–Aug
-                    if month in (9, 10, 11):
-                        return "P1"
-                    if month in (12, 1, 2):
-                        return "P2"
-                    if month in (3, 4, 5):
-                        return "P3"
-                    if month in (6, 7, 8):
-                        return "P4"
-                    return None
-
-                start_dates = pd.to_datetime(metadata_df["start_date"], errors="coerce")
-                metadata_df["_period"] = start_dates.apply(date_to_period)
-                metadata_df = metadata_df[metadata_df["_period"].isin(preferred_periods)]
-                metadata_df = metadata_df.drop(columns=["_period"])
-
-    candidate_ids = set(metadata_df["id"].tolist())
-    if not candidate_ids:
-        return []
+    snapshot = embedding_store.get()
 
-    embedded_modules = pd.read_pickle('data/processed/sentence_embedded_dataframe.pkl')
-    embedded_modules["id"] = embedded_modules["id"].astype(int)
-    embedded_modules = embedded_modules[embedded_modules["id"].isin(candidate_ids)]
-    if embedded_modules.empty:
+    # Hard filters (level, credits, location, language, period) as one vectorised mask over the
+    # precomputed metadata index, mapped straight onto rows of the embedding matrix
+    with stage("filter"):
+        candidate_rows = get_filter_index(metadata_path).candidate_rows(data, snapshot)
+    if candidate_rows.size == 0:
         return []
 
-    # Converting stringified numpy arrays back to actual numpy arrays
-    embedded_modules["sentence_embedding_vector"] = embedded_modules["sentence_embedding_vector"].apply(
-        lambda x: (
-            np.asarray(x, dtype=float)
-            if isinstance(x, (list, np.ndarray))
-            else (
-                np.asarray(ast.literal_eval(x), dtype=float)
-                if isinstance(x, str) and x.strip().startswith("[") and "," in x
-                else (np.fromstring(x.strip("[]"), sep=" ", dtype=float) if isinstance(x, str) else np.asarray(x, dtype=float))
-            )
-        )
-    )
+    # Rows are L2-normalised, so the dot product with the normalised query is the cosine similarity.
+    # The index searches only the filtered rows, exactly or approximately depending on the backend
+    query = normalize_query(vectorized_student_input)
+    k = retrieval_depth()
+    if settings.retrieval_mode == "hybrid":
+        with stage("similarity"):
+            dense_scores = ExactIndex(snapshot.matrix).scores(query, candidate_rows)
+        matches = hybrid_rank(snapshot, candidate_rows, dense_scores, data, metadata_path, k=k)
+    else:
+        with stage("similarity"):
+            top_rows, top_scores = get_ann_index(snapshot).search(query, candidate_rows, k=k)
+        matches = matches_to_records(snapshot, top_rows, top_scores)
 
-    module_matrix = np.stack(embedded_modules["sentence_embedding_vector"].values)
-    scores = cosine_similarity(np.asarray(vectorized_student_input).reshape(1, -1), module_matrix)[0]
+    return rerank_top_5(matches, data, metadata_path, rerank_deadline())
 
-    result = pd.DataFrame({
-        "id": embedded_modules["id"].values,
-        "similarity_score": scores,
-    }).sort_values(by="similarity_score", ascending=False).head(5)
+def retrieval_depth():
+    # With the cross-encoder on, retrieval hands it a longer shortlist to choose the top 5 from
+    return max(settings.rerank_candidates, 5) if settings.rerank_model else 5
 
-    return json.loads(result.to_json(orient="records"))
+def rerank_top_5(
+    matches,
+    data: StudentInput,
+    metadata_path: str = settings.metadata_path,
+    deadline: float | None = None,
+):
+    # Cross-encoder order for as many candidates as the latency budget allows, retrieval order for
+    # the rest. similarity_score stays the cosine similarity of the first stage
+    reranker = get_reranker()
+    if reranker is None or len(matches) <= 1:
+        return matches[:5]
+    with stage("rerank"):
+        texts = get_module_texts(metadata_path)
+        order = reranker.rerank(
+            combine_student_input(data),
+            [texts.get(match["id"], "") for match in matches],
+            deadline if deadline is not None else rerank_deadline(),
+        )
+    return [matches[i] for i in order[:5]]
 
-def add_motivation(
-    vectorized_student_input,
-    top_5_modules: list,
+def hybrid_rank(
+    snapshot,
+    candidate_rows,
+    dense_scores,
     data: StudentInput,
-    metadata_path: str = "data/cleaned/cleaned_dataset_soft-NLP.csv",
+    metadata_path: str = settings.metadata_path,
+    k: int = 5,
+):
+    # Dense and BM25 scores of the same filtered candidates, fused in one pass. Every candidate is
+    # scored densely (no ANN shortcut), since a module can make the top 5 on its BM25 score alone.
+    # similarity_score stays the cosine similarity, so the response means the same in both modes
+    with stage("sparse"):
+        sparse_scores = get_bm25_index(metadata_path).scores(
+            query_terms(combine_student_input(data)), snapshot, candidate_rows,
+        )
+    with stage("fusion"):
+        order = top_k_indices(fuse_scores(dense_scores, sparse_scores), k)
+    return matches_to_records(snapshot, candidate_rows[order], dense_scores[order])
+
+def matches_to_records(snapshot, rows, scores):
+    # Plain Python records, ready for the JSON response
+    return [
+        {"id": int(module_id), "similarity_score": float(score)}
+        for module_id, score in zip(snapshot.ids[rows], scores)
+    ]
+
+def rank_candidates(snapshot, candidate_rows, scores, k: int = 5):
+    order = top_k_indices(scores, k)
+    return matches_to_records(snapshot, candidate_rows[order], scores[order])
+
+def get_top_5_predictions_batch(
+    batch: list[StudentInput],
+    metadata_path: str = settings.metadata_path,
 ):
     """
-    Adds motivation snippets to each recommended module by finding which parts 
-    of the student input best match the module description.
+    Recommends modules for a list of students at once. All combined texts and motivation
+    chunks go through the encoder in one batched call and all students are scored against
+    the module matrix with a single matrix multiply.
     """
-    if not top_5_modules:
+    if not batch:
         return []
-    
-    # Load metadata to get module descriptions
-    metadata_df = pd.read_csv(metadata_path)
-    metadata_df["id"] = metadata_df["id"].astype(int)
-    
-    # Load sentence transformer model
-    model = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
-    device = 'cuda' if torch.cuda.is_available() else 'cpu'
-    
-    # Split student input into meaningful chunks
+
+    # Only students without a cached response are encoded and scored
+    lookups = lookup_responses(batch, metadata_path)
+    misses = [i for i, (_, _, cached) in enumerate(lookups) if cached is None]
+    computed = []
+    if misses:
+        miss_batch = [batch[i] for i in misses]
+        texts = batch_texts(miss_batch)
+        with stage("vectorize"):
+            vectors = embedding_cache.encode(settings.encoder_model, texts)
+        computed = predict_batch_from_vectors(miss_batch, vectors, metadata_path)
+    return merge_cached_results(lookups, misses, computed)
+
+async def get_top_5_predictions_batch_async(
+    batch: list[StudentInput],
+    metadata_path: str = settings.metadata_path,
+):
+    # Counts as one request for the admission limit; the whole batch is one encoder call
+    if not batch:
+        return []
+    lookups = await run_in_pipeline(lookup_responses, batch, metadata_path)
+    misses = [i for i, (_, _, cached) in enumerate(lookups) if cached is None]
+    computed = []
+    if misses:
+        miss_batch = [batch[i] for i in misses]
+        with admission.admit():
+            texts = batch_texts(miss_batch)
+            with stage("vectorize"):
+                vectors = await encoder_batcher.encode(texts)
+            computed = await run_in_pipeline(predict_batch_from_vectors, miss_batch, vectors, metadata_path)
+    return merge_cached_results(lookups, misses, computed)
+
+def merge_cached_results(lookups, misses, computed):
+    # Cached responses for the hits, the freshly computed ones (cached from now on) for the misses
+    results = [cached for _, _, cached in lookups]
+    for i, result in zip(misses, computed):
+        key, version, _ = lookups[i]
+        response_cache.put(key, version, result)
+        results[i] = result
+    return results
+
+def batch_texts(batch: list[StudentInput]):
+    # All combined inputs first, then every student's chunks in order
+    combined_inputs = [combine_student_input(data) for data in batch]
+    chunk_texts = [chunk["text"] for data in batch for chunk in split_student_chunks(data)]
+    return combined_inputs + chunk_texts
+
+def predict_batch_from_vectors(
+    batch: list[StudentInput],
+    vectors,
+    metadata_path: str = settings.metadata_path,
+):
+    chunks_per_student = [split_student_chunks(data) for data in batch]
+    student_vectors = vectors[:len(batch)]
+    chunk_vectors = vectors[len(batch):]
+
+    snapshot = embedding_store.get()
+    query_matrix = l2_normalize(np.asarray(student_vectors, dtype=np.float32))
+    index = get_ann_index(snapshot)
+
+    # Exact backend: (students x modules) cosine similarities in one go.
+    # Approximate backends search per student, since each student probes different cells
+    with stage("similarity"):
+        score_matrix = query_matrix @ snapshot.matrix.T if isinstance(index, ExactIndex) else None
+
+    filter_index = get_filter_index(metadata_path)
+    k = retrieval_depth()
+    # One re-rank budget for the whole batch (from the start of the request)
+    batch_deadline = rerank_deadline()
+    results = []
+    offset = 0
+    for i, data in enumerate(batch):
+        n_chunks = len(chunks_per_student[i])
+        student_chunk_vectors = chunk_vectors[offset:offset + n_chunks]
+        offset += n_chunks
+
+        with stage("filter"):
+            candidate_rows = filter_index.candidate_rows(data, snapshot)
+        if candidate_rows.size == 0:
+            top_5 = []
+        elif settings.retrieval_mode == "hybrid":
+            with stage("similarity"):
+                if score_matrix is not None:
+                    dense_scores = score_matrix[i, candidate_rows]
+                else:
+                    dense_scores = ExactIndex(snapshot.matrix).scores(query_matrix[i], candidate_rows)
+            top_5 = hybrid_rank(snapshot, candidate_rows, dense_scores, data, metadata_path, k=k)
+        else:
+            with stage("similarity"):
+                if score_matrix is not None:
+                    top_5 = rank_candidates(snapshot, candidate_rows, score_matrix[i, candidate_rows], k=k)
+                else:
+                    top_5 = matches_to_records(snapshot, *index.search(query_matrix[i], candidate_rows, k=k))
+        # Split what is left of it evenly over the students still to come; time a student does not
+        # use goes to the next ones
+        now = time.perf_counter()
+        student_deadline = now + max(0.0, batch_deadline - now) / (len(batch) - i)
+        top_5 = rerank_top_5(top_5, data, metadata_path, student_deadline)
+        results.append(add_motivation(
+            student_vectors[i], top_5, data, metadata_path=metadata_path, chunk_vectors=student_chunk_vectors,
+        ))
+    return results
+
+def split_student_chunks(data: StudentInput):
+    # Split student input into meaningful chunks: the current study, each interest and each learning goal
     student_chunks = []
     
     # Add current study as a chunk
@@ -235,13 +448,52 @@ def add_motivation(
                 "category": "leerdoel"
             })
     
-    # Vectorize all student chunks
+    return student_chunks
+
+@timed("motivation")
+def add_motivation(
+    vectorized_student_input,
+    top_5_modules: list,
+    data: StudentInput,
+    metadata_path: str = settings.metadata_path,
+    chunk_vectors=None,
+    rng=None,
+):
+    """
+    Adds motivation snippets to each recommended module by finding which parts 
+    of the student input best match the module description.
+    """
+    return list(iter_motivations(
+        vectorized_student_input, top_5_modules, data, metadata_path=metadata_path, chunk_vectors=chunk_vectors, rng=rng,
+    ))
+
+def iter_motivations(
+    vectorized_student_input,
+    top_5_modules: list,
+    data: StudentInput,
+    metadata_path: str = settings.metadata_path,
+    chunk_vectors=None,
+    rng=None,
+):
+    # Generator behind add_motivation: yields each module with its motivation as soon as it is built.
+    # Templates come from a generator seeded with the input hash: same input, same sentences
+    if not top_5_modules:
+        return
+    rng = rng or template_rng(data)
+    
+    # Precomputed, L2-normalised module description embeddings
+    descriptions = get_description_store(metadata_path).get()
+    
+    # Split student input into meaningful chunks
+    student_chunks = split_student_chunks(data)
+    
+    # Vectorize all student chunks (the batch path passes them in, already encoded)
     if student_chunks:
-        chunk_texts = [chunk["text"] for chunk in student_chunks]
-        chunk_vectors = model.encode(chunk_texts, show_progress_bar=False, device=device)
+        if chunk_vectors is None:
+            chunk_texts = [chunk["text"] for chunk in student_chunks]
+            chunk_vectors = embedding_cache.encode(settings.encoder_model, chunk_texts)
         
-        for i, chunk in enumerate(student_chunks):
-            chunk["vector"] = chunk_vectors[i]
+        chunk_matrix = l2_normalize(np.asarray(chunk_vectors, dtype=np.float32))
     
     # Template sentences for each category
     templates = {
@@ -265,53 +517,31 @@ def add_motivation(
         ]
     }
     
+    # Relevance of every chunk for every recommended module in one (chunks x modules) product.
+    # Modules without a description get no column and therefore no motivation.
+    description_rows = [descriptions.row_of.get(int(module["id"])) for module in top_5_modules]
+    described = [j for j, row in enumerate(description_rows) if row is not None]
+    relevance = None
+    if student_chunks and described:
+        relevance = chunk_matrix @ descriptions.matrix[[description_rows[j] for j in described]].T
+    relevance_column = {j: column for column, j in enumerate(described)}
+
     # Process each module in top 5
-    results = []
-    for module in top_5_modules:
-        module_id = module["id"]
-        
-        # Get module description from metadata
-        module_row = metadata_df[metadata_df["id"] == module_id]
-        
-        if module_row.empty:
-            results.append({
+    for j, module in enumerate(top_5_modules):
+        if relevance is None or j not in relevance_column:
+            yield {
                 **module,
                 "motivation": ""
-            })
-            continue
-        
-        # Build module description from available fields
-        module_description_parts = []
-        for col in ["modulename", "description", "content", "learninggoals"]:
-            if col in module_row.columns:
-                value = module_row.iloc[0][col]
-                if pd.notna(value) and str(value).strip():
-                    module_description_parts.append(str(value))
-        
-        module_description = ". ".join(module_description_parts)
-        
-        if not module_description.strip() or not student_chunks:
-            results.append({
-                **module,
-                "motivation": ""
-            })
+            }
             continue
         
-        # Vectorize module description
-        module_vector = model.encode(module_description, show_progress_bar=False, device=device)
-        
         # Calculate similarity between each student chunk and the module
         chunk_similarities = []
-        for chunk in student_chunks:
-            similarity = cosine_similarity(
-                chunk["vector"].reshape(1, -1),
-                module_vector.reshape(1, -1)
-            )[0][0]
-            
+        for i, chunk in enumerate(student_chunks):
             chunk_similarities.append({
                 "text": chunk["text"],
                 "category": chunk["category"],
-                "relevance_score": float(similarity)
+                "relevance_score": float(relevance[i, relevance_column[j]])
             })
         
         # Sort by relevance and get the best match
@@ -334,18 +564,16 @@ def add_motivation(
             formatted_keywords = ", ".join([f"**{kw}**" for kw in keywords])
             
             # Select random template for this category
-            template = random.choice(templates.get(category, templates["interesse"]))
+            template = rng.choice(templates.get(category, templates["interesse"]))
             motivation_text = template.format(formatted_keywords)
             
-            results.append({
+            yield {
                 **module,
                 "motivation": motivation_text
-            })
+            }
         else:
-            results.append({
+            yield {
                 **module,
                 "motivation": ""
-            })
-    
-    return results
+            }
 
@@ -0,0 +1,132 @@
+import gc
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from config import settings
+from services.description_store import DescriptionStore, get_description_store
+from services.warmup import WARMUP_STEPS
+
+logger = logging.getLogger(__name__)
+
+# A worker that dies this soon after being forked is not restarted (it would only crash again)
+MIN_WORKER_LIFETIME_SECONDS = 5
+
+
+def build_description_cache(path: str, metadata_path: str, model_name: str) -> None:
+    # Runs in a spawned process: encodes the module descriptions and writes the on-disk cache
+    DescriptionStore(path, metadata_path, model_name).load()
+
+
+def preload_descriptions() -> None:
+    # The parent may only read the description cache. On a miss (fresh container, other encoder,
+    # edited catalogue) a spawned process encodes and writes it, so torch never starts its thread
+    # pools in the parent. If the cache still cannot be read, each worker encodes in its warm-up
+    store = get_description_store(settings.metadata_path)
+    if store.load_cached() is not None or store.path is None:
+        return
+    logger.info("Building the description embedding cache in a subprocess")
+    process = multiprocessing.get_context("spawn").Process(
+        target=build_description_cache, args=(store.path, store.metadata_path, store.model_name)
+    )
+    process.start()
+    process.join()
+    if process.exitcode != 0 or store.load_cached() is None:
+        logger.warning("No description embedding cache; every worker encodes the descriptions itself")
+
+
+def preload() -> None:
+    """
+    Loads every read-only artifact in the parent: encoder weights, the (memory-mapped) embedding
+    matrix and retrieval index, the filter index and the cached description embeddings. Forked
+    workers share these pages copy-on-write. No inference runs in the parent: torch's thread pools
+    do not survive a fork, so each worker does its own dummy inference in the warm-up.
+    """
+    for name, step in WARMUP_STEPS:
+        if name == "description_store":
+            preload_descriptions()
+        elif name != "dummy_inference":
+            step()
+
+    # Move everything loaded so far out of the garbage collector's reach; a GC pass would
+    # otherwise write to these objects in every worker and un-share their pages
+    gc.collect()
+    gc.freeze()
+
+
+def _serve_worker(app, sock: socket.socket, workers: int) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # Split the cores between the workers instead of every worker using all of them. torch is only
+    # there when the parent's preload loaded a torch-based encoder (not with the stub encoder)
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+
+    config = uvicorn.Config(app, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def run_prefork(app, host: str, port: int, workers: int) -> None:
+    # Parent: preload, open the listening socket, fork the workers and restart any that crash.
+    # uvicorn only configures logging inside the workers, so the parent gets a plain handler
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+    preload()
+
+    sock = socket.create_server((host, port), backlog=2048)
+    sock.set_inheritable(True)
+
+    children: dict[int, float] = {}
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            # Never return into the parent's loop; os._exit skips the parent's atexit handlers
+            try:
+                _serve_worker(app, sock, workers)
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+                os._exit(1)
+            os._exit(0)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+    logger.info("Pre-fork: parent %d serving http://%s:%d with workers %s", os.getpid(), host, port, sorted(children))
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if stopping or started is None:
+            continue
+        if time.monotonic() - started < MIN_WORKER_LIFETIME_SECONDS:
+            logger.error("Worker %d exited right after start (status %d), shutting down", pid, status)
+            stop(signal.SIGTERM, None)
+            continue
+        logger.warning("Worker %d exited (status %d), restarting", pid, status)
+        spawn()
+
+    sock.close()
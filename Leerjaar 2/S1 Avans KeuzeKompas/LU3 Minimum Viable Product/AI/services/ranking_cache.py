@@ -0,0 +1,119 @@
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from config import settings
+
+
+class InvalidCursor(ValueError):
+    """The cursor is malformed or belongs to a different input."""
+
+
+class StaleCursor(ValueError):
+    """The catalogue changed since the cursor was issued; paging has to start over."""
+
+
+@dataclass(frozen=True)
+class CatalogueRanking:
+    # Embedding rows of the whole (or filtered) catalogue, best first, with their cosine scores
+    rows: np.ndarray
+    scores: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes + self.scores.nbytes
+
+
+def _tag(value: str, length: int) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:length]
+
+
+def encode_cursor(key: str, version: str, offset: int) -> str:
+    # Opaque to clients: which ranking (a hash of the whole ranking key: input and filtered/all),
+    # which catalogue version and where to continue
+    payload = json.dumps([_tag(key, 16), _tag(version, 12), offset], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str, version: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_key, version_tag, offset = json.loads(base64.urlsafe_b64decode(padded))
+        offset = int(offset)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if cursor_key != _tag(key, 16) or offset < 0:
+        raise InvalidCursor(cursor)
+    if version_tag != _tag(version, 12):
+        raise StaleCursor(cursor)
+    return offset
+
+
+class RankingCache:
+    """
+    Bounded LRU cache (with TTL) of complete catalogue rankings, keyed on the input hash, so the
+    pages after the first are slices of a stored order instead of a new scoring pass. The key
+    depends only on the input, not on a server-side session: with several workers a page that
+    lands on another worker is scored once there and then cached as well. Like the response
+    cache, a new catalogue version empties it.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, CatalogueRanking]] = OrderedDict()
+        self._version: str | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, version: str) -> CatalogueRanking | None:
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds > 0 and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, version: str, ranking: CatalogueRanking) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (time.monotonic(), ranking)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _check_version(self, version: str) -> None:
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "bytes": sum(ranking.nbytes for _, ranking in self._entries.values()),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+ranking_cache = RankingCache(settings.ranking_cache_size, settings.ranking_cache_ttl_seconds)
@@ -0,0 +1,136 @@
+import threading
+import time
+
+import numpy as np
+
+from config import settings
+from services.catalogue import catalogue_digest, load_catalogue
+from services.embedding_pipeline import module_texts
+from services.metrics import request_started
+from services.model_registry import registry
+
+
+class Reranker:
+    """
+    Second ranking stage: a cross-encoder reads the student input and a candidate module's text
+    together, which judges long learning-goal sentences better than comparing two embeddings.
+    Candidates are scored in batches, best retrieved first, until the deadline: a running
+    estimate of the seconds per pair decides how many still fit. Candidates that do not fit
+    keep their retrieval order below the re-ranked ones; when nothing fits the stage is skipped.
+    """
+
+    def __init__(self, model, batch_size: int):
+        self.model = model
+        self.batch_size = batch_size
+        self.seconds_per_pair: float | None = None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.complete = 0
+        self.truncated = 0
+        self.skipped = 0
+
+    def score(self, query: str, texts: list[str], deadline: float) -> np.ndarray:
+        # Cross-encoder scores for a prefix of texts: as many as the deadline allows
+        scores = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            remaining = deadline - time.perf_counter()
+            if self.seconds_per_pair is not None:
+                batch = batch[:max(0, int(remaining / self.seconds_per_pair))]
+            elif remaining <= 0:
+                batch = []
+            if not batch:
+                break
+
+            started = time.perf_counter()
+            batch_scores = self.model.predict(
+                [(query, text) for text in batch], batch_size=len(batch), show_progress_bar=False,
+            )
+            self._observe(len(batch), time.perf_counter() - started)
+            scores.extend(np.asarray(batch_scores, dtype=np.float32).reshape(-1))
+
+        with self._lock:
+            self.calls += 1
+            if not scores:
+                self.skipped += 1
+            elif len(scores) < len(texts):
+                self.truncated += 1
+            else:
+                self.complete += 1
+        return np.asarray(scores, dtype=np.float32)
+
+    def rerank(self, query: str, texts: list[str], deadline: float) -> np.ndarray:
+        # New order of the candidates: the scored prefix by cross-encoder score, then the rest as retrieved
+        scores = self.score(query, texts, deadline)
+        return np.concatenate([np.argsort(-scores, kind="stable"), np.arange(len(scores), len(texts))])
+
+    def _observe(self, pairs: int, seconds: float) -> None:
+        # Exponential moving average, so the estimate follows the load on the machine
+        per_pair = seconds / pairs
+        with self._lock:
+            if self.seconds_per_pair is None:
+                self.seconds_per_pair = per_pair
+            else:
+                self.seconds_per_pair = 0.7 * self.seconds_per_pair + 0.3 * per_pair
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "model": settings.rerank_model,
+                "calls": self.calls,
+                "complete": self.complete,
+                "truncated": self.truncated,
+                "skipped": self.skipped,
+                "ms_per_pair": round(self.seconds_per_pair * 1000, 3) if self.seconds_per_pair else None,
+                "budget_ms": settings.rerank_budget_ms,
+                "candidates": settings.rerank_candidates,
+            }
+
+
+def rerank_deadline(started: float | None = None) -> float:
+    # By default the budget counts from the start of the request (set by the middleware in
+    # main.py), so time spent queueing and encoding counts too. Outside a request it starts now
+    if started is None:
+        started = request_started()
+    return (started if started is not None else time.perf_counter()) + settings.rerank_budget_ms / 1000
+
+
+_reranker: Reranker | None = None
+_reranker_lock = threading.Lock()
+
+
+def get_reranker() -> Reranker | None:
+    # None while re-ranking is switched off (KEUZEKOMPAS_RERANK_MODEL empty)
+    global _reranker
+    if not settings.rerank_model:
+        return None
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None:
+                _reranker = Reranker(
+                    registry.load_cross_encoder(settings.rerank_model, device="cpu"), settings.rerank_batch_size,
+                )
+    return _reranker
+
+
+def loaded_reranker() -> Reranker | None:
+    # The re-ranker if a request or the warm-up already loaded it; never loads the model itself
+    return _reranker if settings.rerank_model else None
+
+
+_texts: dict[str, tuple[str, dict[int, str]]] = {}
+_texts_lock = threading.Lock()
+
+
+def get_module_texts(metadata_path: str = settings.metadata_path) -> dict[int, str]:
+    # Module id -> the text the cross-encoder reads: the same fields as the module embeddings.
+    # Rebuilt when the metadata file's content changes
+    digest = catalogue_digest(metadata_path)
+    entry = _texts.get(metadata_path)
+    if entry is None or entry[0] != digest:
+        with _texts_lock:
+            entry = _texts.get(metadata_path)
+            if entry is None or entry[0] != digest:
+                entry = (digest, module_texts(load_catalogue(metadata_path, settings.catalogue_cache_dir)))
+                _texts[metadata_path] = entry
+    return entry[1]
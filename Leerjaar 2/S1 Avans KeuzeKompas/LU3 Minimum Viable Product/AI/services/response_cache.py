@@ -0,0 +1,105 @@
+import hashlib
+import json
+import random
+import threading
+from collections import OrderedDict
+
+from config import settings
+from models.student_input import StudentInput
+from services.catalogue import catalogue_digest
+from services.model_registry import encoder_id
+
+# Filter fields act as sets: their order does not change the recommendations
+SET_FIELDS = ("location_preference", "level_preference", "preferred_period")
+
+
+def input_hash(data: StudentInput) -> str:
+    # Canonical hash of a validated input. Interests and learning goals keep their order, which
+    # shapes the combined text and the motivation chunks
+    canonical = data.model_dump()
+    for field in SET_FIELDS:
+        canonical[field] = sorted(set(canonical[field]))
+    canonical["wanted_study_credit_range"] = list(canonical["wanted_study_credit_range"])
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def template_rng(data: StudentInput, key: str | None = None) -> random.Random:
+    # Motivation templates are picked with a generator seeded from the input hash, so the same
+    # input always gets the same sentences, cached or not
+    return random.Random(int((key or input_hash(data))[:16], 16))
+
+
+def catalogue_version(snapshot, metadata_path: str) -> str:
+    # Everything a cached response depends on besides the input. The embedding snapshot version
+    # changes whenever the store is rebuilt and the catalogue digest whenever the metadata file
+    # is replaced; either drops the whole cache
+    return "|".join([
+        snapshot.version, metadata_path, catalogue_digest(metadata_path)[:16], encoder_id(settings.encoder_model),
+        settings.retrieval_mode, settings.fusion_method, settings.rerank_model,
+    ])
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of complete recommendation responses (top 5 with motivations), keyed on
+    the canonical input hash. Entries belong to one catalogue version; the first lookup under a
+    new version empties the cache, so a rebuilt embedding store never serves stale rankings.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[dict, ...]] = OrderedDict()
+        self._version: str | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str, version: str) -> list[dict] | None:
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Fresh dicts: callers may add to them, the cached tuple stays as it was
+        return [dict(module) for module in entry]
+
+    def put(self, key: str, version: str, response: list[dict]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = tuple(dict(module) for module in response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _check_version(self, version: str) -> None:
+        if version != self._version:
+            if self._version is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "invalidations": self.invalidations,
+            }
+
+
+response_cache = ResponseCache(settings.response_cache_size)
@@ -0,0 +1,23 @@
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first. Uses an O(n) partial selection
+    (argpartition) and only sorts the k selected items; ties are ordered by index.
+    """
+    scores = np.asarray(scores)
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+
+    # argpartition picks arbitrarily among scores tied with the k-th one, so keep
+    # everything strictly better and fill up with the lowest-index ties
+    kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    better = np.flatnonzero(scores > kth_score)
+    ties = np.flatnonzero(scores == kth_score)[:k - better.size]
+    selected = np.concatenate([better, ties])
+    # lexsort sorts on the last key first: score descending, then index ascending
+    return selected[np.lexsort((selected, -scores[selected]))]
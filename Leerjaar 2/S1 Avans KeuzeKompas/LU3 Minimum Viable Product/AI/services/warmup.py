@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+
+from config import settings
+from models.student_input import StudentInput
+from services.ann_index import get_ann_index
+from services.bm25_index import get_bm25_index
+from services.description_store import get_description_store
+from services.embedding_store import embedding_store
+from services.filter_index import get_filter_index
+from services.model_registry import registry
+from services.metrics import muted
+from services.reranker import get_module_texts, get_reranker
+from services.predict_service import combine_student_input, predict_from_vectors, split_student_chunks
+
+logger = logging.getLogger(__name__)
+
+# Fixed questionnaire for the dummy inference: touches every filter and every motivation category
+WARMUP_INPUT = StudentInput(
+    current_study="Informatica",
+    interests=["programmeren", "data en AI"],
+    wanted_study_credit_range=(0, 30),
+    location_preference=["Tilburg", "Breda", "Den Bosch", "Roosendaal"],
+    learning_goals=["leren samenwerken"],
+    level_preference=["NLQF5", "NLQF6"],
+    preferred_language="Niet van toepassing",
+    preferred_period=["P1", "P2", "P3", "P4"],
+)
+
+
+def dummy_inference() -> None:
+    # Every stage once (encoder, filters, retrieval, re-rank, motivations), but past the response
+    # and embedding caches and with the metrics muted: warm-up traffic must not show up in the
+    # cache counters or the latency histograms
+    with muted():
+        texts = [combine_student_input(WARMUP_INPUT)] + [chunk["text"] for chunk in split_student_chunks(WARMUP_INPUT)]
+        model = registry.get(settings.encoder_model)
+        vectors = model.encode(texts, batch_size=settings.encode_batch_size, show_progress_bar=False)
+        predict_from_vectors(WARMUP_INPUT, vectors[0], vectors[1:])
+
+
+# Warm-up steps in order; later steps rely on the earlier ones being loaded. get() instead of
+# load(): anything a pre-fork parent already loaded (see services/prefork.py) is reused, not re-read
+WARMUP_STEPS = [
+    ("encoder", lambda: registry.load(settings.encoder_model)),
+    ("embedding_store", lambda: get_ann_index(embedding_store.get())),
+    ("filter_index", lambda: get_filter_index(settings.metadata_path)),
+    ("bm25_index", lambda: settings.retrieval_mode == "hybrid" and get_bm25_index(settings.metadata_path)),
+    ("description_store", lambda: get_description_store(settings.metadata_path).get()),
+    ("reranker", lambda: settings.rerank_model and get_reranker() and get_module_texts(settings.metadata_path)),
+    ("dummy_inference", dummy_inference),
+]
+
+
+class Warmup:
+    """
+    Loads the encoder, embedding store, metadata index and description embeddings and runs one
+    dummy inference in a background thread, so the server can answer /health while it warms up.
+    /ready only reports ready once every step has finished; per-step timings are kept for it.
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.components = {name: {"status": "pending"} for name, _ in steps}
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def status(self) -> str:
+        statuses = {component["status"] for component in self.components.values()}
+        if "failed" in statuses:
+            return "failed"
+        if statuses == {"ready"}:
+            return "ready"
+        return "warming_up"
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+            self._thread.start()
+
+    def run(self) -> None:
+        self.started_at = time.perf_counter()
+        for name, step in self.steps:
+            component = self.components[name]
+            component["status"] = "loading"
+            started = time.perf_counter()
+            try:
+                step()
+            except Exception as exc:
+                component.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+                logger.exception("Warm-up step '%s' failed", name)
+                break
+            component.update(status="ready", seconds=round(time.perf_counter() - started, 3))
+        self.finished_at = time.perf_counter()
+
+    def skip(self) -> None:
+        # Lazy mode (preload_models off): everything loads on the first request instead
+        for component in self.components.values():
+            component["status"] = "ready"
+            component["skipped"] = True
+
+    def report(self) -> dict:
+        total = None
+        if self.started_at is not None:
+            total = round((self.finished_at or time.perf_counter()) - self.started_at, 3)
+        return {
+            "status": self.status,
+            "total_seconds": total,
+            "components": {name: dict(component) for name, component in self.components.items()},
+        }
+
+
+warmup = Warmup(WARMUP_STEPS)
@@ -0,0 +1,28 @@
+import json
+import os
+import sys
+
+# Tests run against the deterministic stub encoder: offline, no torch needed.
+# Set before config is imported anywhere
+os.environ.setdefault("KEUZEKOMPAS_ENCODER_BACKEND", "stub")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+
+from models.student_input import StudentInput
+
+FIXTURES = os.path.join(ROOT, "scripts", "fixtures", "student_inputs.json")
+
+
+@pytest.fixture(scope="session")
+def student_inputs() -> list[dict]:
+    with open(FIXTURES) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def student(student_inputs) -> StudentInput:
+    return StudentInput(**student_inputs[0])
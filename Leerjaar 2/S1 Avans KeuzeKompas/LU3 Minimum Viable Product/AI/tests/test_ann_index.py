@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from services.ann_index import ExactIndex, QuantizedIndex
+from services.embedding_store import l2_normalize
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    rng = np.random.default_rng(0)
+    return l2_normalize(rng.standard_normal((500, 32)).astype(np.float32))
+
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_quantized_search_returns_k_results_when_k_exceeds_rerank(matrix, dtype):
+    query = matrix[7]
+    rows = np.arange(len(matrix))
+    index = QuantizedIndex(matrix, dtype, rerank=3)
+
+    top_rows, top_scores = index.search(query, rows, k=20)
+
+    assert len(top_rows) == 20
+    assert top_rows[0] == 7
+    assert np.all(np.diff(top_scores) <= 0)
+
+
+def test_quantized_search_matches_exact_with_deep_rerank(matrix):
+    query = matrix[11]
+    rows = np.arange(0, len(matrix), 2)
+    exact_rows, _ = ExactIndex(matrix).search(query, rows, k=5)
+    quantized_rows, _ = QuantizedIndex(matrix, "int8", rerank=100).search(query, rows, k=5)
+    assert quantized_rows.tolist() == exact_rows.tolist()
+
+
+def test_negative_rerank_is_rejected(matrix):
+    with pytest.raises(ValueError):
+        QuantizedIndex(matrix, "int8", rerank=-1)
@@ -0,0 +1,123 @@
+import time
+
+import numpy as np
+import pytest
+
+from config import settings
+from services.embedding_cache import EmbeddingCache
+from services.ranking_cache import CatalogueRanking, RankingCache
+from services.response_cache import ResponseCache
+
+
+class Clock:
+    # Stand-in for time.monotonic() that only moves when told to
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    # Both TTL caches read time.monotonic() through the time module
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def ranking(n: int) -> CatalogueRanking:
+    return CatalogueRanking(rows=np.arange(n, dtype=np.int32), scores=np.zeros(n, dtype=np.float32))
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "v1", [{"id": 1}])
+    cache.put("b", "v1", [{"id": 2}])
+    assert cache.get("a", "v1") == [{"id": 1}]  # a is now the most recent
+    cache.put("c", "v1", [{"id": 3}])
+
+    assert cache.get("b", "v1") is None
+    assert cache.get("a", "v1") == [{"id": 1}]
+    assert cache.get("c", "v1") == [{"id": 3}]
+
+
+def test_response_cache_is_emptied_by_a_new_version():
+    cache = ResponseCache(max_entries=4)
+    cache.put("a", "v1", [{"id": 1}])
+    assert cache.get("a", "v2") is None
+    assert cache.get("a", "v1") is None
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_response_cache_returns_copies():
+    cache = ResponseCache(max_entries=4)
+    cache.put("a", "v1", [{"id": 1}])
+    cache.get("a", "v1")[0]["motivation"] = "changed"
+    assert cache.get("a", "v1") == [{"id": 1}]
+
+
+def test_disabled_caches_store_nothing():
+    response_cache = ResponseCache(max_entries=0)
+    response_cache.put("a", "v1", [{"id": 1}])
+    assert response_cache.get("a", "v1") is None
+
+    ranking_cache = RankingCache(max_entries=0, ttl_seconds=0)
+    ranking_cache.put("a", "v1", ranking(3))
+    assert ranking_cache.get("a", "v1") is None
+
+
+def test_ranking_cache_evicts_least_recently_used():
+    cache = RankingCache(max_entries=2, ttl_seconds=0)
+    cache.put("a", "v1", ranking(1))
+    cache.put("b", "v1", ranking(2))
+    cache.get("a", "v1")
+    cache.put("c", "v1", ranking(3))
+
+    assert cache.get("b", "v1") is None
+    assert len(cache.get("a", "v1").rows) == 1
+    assert cache.stats()["bytes"] == ranking(1).nbytes + ranking(3).nbytes
+
+
+def test_ranking_cache_expires_after_ttl(clock):
+    cache = RankingCache(max_entries=4, ttl_seconds=60)
+    cache.put("a", "v1", ranking(3))
+
+    clock.now += 59
+    assert cache.get("a", "v1") is not None
+    clock.now += 2
+    assert cache.get("a", "v1") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_ranking_cache_is_emptied_by_a_new_version():
+    cache = RankingCache(max_entries=4, ttl_seconds=0)
+    cache.put("a", "v1", ranking(3))
+    assert cache.get("a", "v2") is None
+
+
+def test_embedding_cache_evicts_and_expires(clock):
+    cache = EmbeddingCache(max_entries=2, ttl_seconds=60)
+    model = settings.encoder_model
+    first = cache.encode(model, ["een", "twee"])
+    assert cache.stats()["misses"] == 2
+
+    # Whitespace and unicode form do not change the key
+    assert np.array_equal(cache.encode(model, ["  een "])[0], first[0])
+    assert cache.stats()["hits"] == 1
+
+    cache.encode(model, ["drie"])  # evicts "twee", the least recently used
+    cache.encode(model, ["twee"])
+    assert cache.stats()["misses"] == 4
+
+    clock.now += 61
+    cache.encode(model, ["twee"])
+    assert cache.stats()["misses"] == 5
+    assert cache.stats()["size"] == 2
+
+
+def test_embedding_cache_encodes_duplicates_once():
+    cache = EmbeddingCache(max_entries=8, ttl_seconds=0)
+    vectors = cache.encode(settings.encoder_model, ["zelfde tekst", "zelfde tekst", "andere tekst"])
+    assert np.array_equal(vectors[0], vectors[1])
+    assert cache.stats()["size"] == 2
@@ -0,0 +1,48 @@
+import os
+
+import pandas as pd
+
+from config import settings
+from services import bm25_index
+from services.bm25_index import get_bm25_index
+from services.description_store import DescriptionStore
+from services.embedding_store import embedding_store
+from services.reranker import get_module_texts
+from services.response_cache import catalogue_version
+
+
+def rewrite(path, df):
+    # Also moves the mtime on, so a rewrite within the same clock tick counts as a change
+    stat = os.stat(path) if os.path.exists(path) else None
+    df.to_csv(path, index=False)
+    if stat is not None:
+        os.utime(path, ns=(stat.st_mtime_ns + 1_000_000, stat.st_mtime_ns + 1_000_000))
+
+
+def test_catalogue_content_changes_are_picked_up(tmp_path, monkeypatch):
+    # The cache invalidation is under test here, not the Dutch/English NLP (which needs NLTK corpora)
+    monkeypatch.setattr(bm25_index, "catalogue_terms",
+                        lambda df: [str(text).lower().split() for text in df["description"]])
+    catalogue = pd.read_csv(settings.metadata_path)
+    path = str(tmp_path / "catalogue.csv")
+    rewrite(path, catalogue.head(20))
+
+    snapshot = embedding_store.get()
+    version = catalogue_version(snapshot, path)
+    bm25 = get_bm25_index(path)
+    texts = get_module_texts(path)
+    store = DescriptionStore(None, path, settings.encoder_model)
+    descriptions = store.get()
+    assert store.get() is descriptions
+    assert catalogue_version(snapshot, path) == version
+
+    edited = catalogue.head(20).copy()
+    edited.loc[0, "description"] = "Een volledig herschreven beschrijving"
+    rewrite(path, edited)
+
+    assert catalogue_version(snapshot, path) != version
+    assert get_bm25_index(path) is not bm25
+    assert "herschreven" in get_bm25_index(path).vocabulary
+    assert get_module_texts(path) is not texts
+    assert "herschreven" in get_module_texts(path)[int(edited.loc[0, "id"])]
+    assert store.get() is not descriptions
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from controllers.predict_controller import predict_catalogue
+from services.ranking_cache import InvalidCursor, StaleCursor, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("abc:all", "v1", 40)
+    assert decode_cursor(cursor, "abc:all", "v1") == 40
+
+
+def test_cursor_of_other_input_is_invalid():
+    cursor = encode_cursor("abc:all", "v1", 20)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "def:all", "v1")
+
+
+def test_cursor_of_unfiltered_ranking_is_invalid_for_filtered():
+    # Same input, other ranking: the filtered/all suffix is part of what the cursor identifies
+    cursor = encode_cursor("abc:all", "v1", 20)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "abc:filtered", "v1")
+
+
+def test_cursor_of_older_catalogue_is_stale():
+    cursor = encode_cursor("abc:all", "v1", 20)
+    with pytest.raises(StaleCursor):
+        decode_cursor(cursor, "abc:all", "v2")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "W10", encode_cursor("abc:all", "v1", -1)])
+def test_malformed_cursor_is_invalid(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "abc:all", "v1")
+
+
+def test_catalogue_endpoint_rejects_unfiltered_cursor_for_filtered(student):
+    first = asyncio.run(predict_catalogue(student, cursor=None, limit=5, filtered=False))
+    assert first["next_cursor"] is not None
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(predict_catalogue(student, cursor=first["next_cursor"], limit=5, filtered=True))
+    assert error.value.status_code == 400
+
+    second = asyncio.run(predict_catalogue(student, cursor=first["next_cursor"], limit=5, filtered=False))
+    assert [m["rank"] for m in second["modules"]] == [6, 7, 8, 9, 10]
+
+
+
+def test_filtered_catalogue_filters_off_the_event_loop(student, monkeypatch):
+    from services import predict_service
+    from services.ranking_cache import RankingCache
+
+    threads = []
+    get_filter_index = predict_service.get_filter_index
+
+    def recording_get_filter_index(path):
+        threads.append(threading.get_ident())
+        return get_filter_index(path)
+
+    monkeypatch.setattr(predict_service, "get_filter_index", recording_get_filter_index)
+    # A fresh cache, so the page is ranked here and not served from an earlier test
+    monkeypatch.setattr(predict_service, "ranking_cache", RankingCache(max_entries=0, ttl_seconds=0))
+
+    async def page():
+        return threading.get_ident(), await predict_catalogue(student, cursor=None, limit=5, filtered=True)
+
+    loop_thread, result = asyncio.run(page())
+    assert threads and loop_thread not in threads
+    assert [m["rank"] for m in result["modules"]] == list(range(1, len(result["modules"]) + 1))
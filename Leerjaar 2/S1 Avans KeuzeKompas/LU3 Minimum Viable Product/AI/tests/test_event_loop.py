@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+import pytest
+
+from services import predict_service
+from services.embedding_store import embedding_store
+from services.ranking_cache import RankingCache
+from services.response_cache import ResponseCache
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+REQUESTS = {
+    "predict": lambda student: predict_service.get_top_5_prediction_async(student),
+    "stream": lambda student: collect(predict_service.stream_top_5_prediction(student)),
+    "batch": lambda student: predict_service.get_top_5_predictions_batch_async([student, student]),
+    "catalogue": lambda student: predict_service.ranked_catalogue_page_async(student, limit=5),
+}
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["miss", "hit"])
+@pytest.mark.parametrize("request_name", list(REQUESTS))
+def test_store_refresh_runs_off_the_event_loop(student, monkeypatch, request_name, cached):
+    # embedding_store.get() stats the store files (and reloads on change): never on the loop
+    monkeypatch.setattr(predict_service, "response_cache", ResponseCache(max_entries=16))
+    monkeypatch.setattr(predict_service, "ranking_cache", RankingCache(max_entries=16, ttl_seconds=0))
+    threads = []
+    get = embedding_store.get
+
+    def recording_get():
+        threads.append(threading.get_ident())
+        return get()
+
+    async def run():
+        if cached:
+            await REQUESTS[request_name](student)
+        threads.clear()
+        await REQUESTS[request_name](student)
+        return threading.get_ident()
+
+    monkeypatch.setattr(embedding_store, "get", recording_get)
+    loop_thread = asyncio.run(run())
+    assert threads and loop_thread not in threads
@@ -0,0 +1,136 @@
+import ast
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_catalogue
+from config import settings
+from models.student_input import ALLOWED_LOCATIONS, StudentInput
+from services.catalogue import MONTH_PERIODS
+from services.filter_index import FilterIndex, get_filter_index
+
+
+def write_catalogue(path, df):
+    df.to_csv(path, index=False)
+    # A rewrite within the same clock tick must still count as a change
+    os.utime(path, ns=(os.stat(path).st_mtime_ns + 1_000_000, os.stat(path).st_mtime_ns + 1_000_000))
+
+
+def test_filter_index_is_rebuilt_when_the_catalogue_changes(tmp_path):
+    catalogue = pd.read_csv(settings.metadata_path)
+    path = str(tmp_path / "catalogue.csv")
+
+    write_catalogue(path, catalogue.head(20))
+    first = get_filter_index(path)
+    assert get_filter_index(path) is first
+    assert len(first.ids) == 20
+
+    write_catalogue(path, catalogue.head(10))
+    second = get_filter_index(path)
+    assert second is not first
+    assert second.ids.tolist() == catalogue["id"].head(10).tolist()
+
+
+def pandas_candidate_ids(metadata_path: str, data: StudentInput) -> list[int]:
+    # The filters of filter_matches_top_5 before the FilterIndex, on a fresh pd.read_csv
+    metadata_df = pd.read_csv(metadata_path)
+    metadata_df["id"] = metadata_df["id"].astype(int)
+
+    if data.level_preference and "level" in metadata_df.columns:
+        metadata_df = metadata_df[metadata_df["level"].isin(data.level_preference)]
+
+    min_credits, max_credits = data.wanted_study_credit_range
+    if "studycredit" in metadata_df.columns:
+        metadata_df = metadata_df[(metadata_df["studycredit"] >= min_credits) & (metadata_df["studycredit"] <= max_credits)]
+
+    if data.location_preference and "location" in metadata_df.columns:
+        preferred_locations = set(data.location_preference)
+
+        def normalize_locations(value):
+            if isinstance(value, str):
+                s = value.strip()
+                if s.startswith("[") and s.endswith("]"):
+                    try:
+                        parsed = ast.literal_eval(s)
+                        if isinstance(parsed, list):
+                            return parsed
+                    except (ValueError, SyntaxError):
+                        pass
+                return [s]
+            if pd.isna(value):
+                return []
+            return [str(value)]
+
+        # astype(bool): on an empty frame apply() gives no boolean mask and the old code lost its columns
+        locations = metadata_df["location"].apply(normalize_locations)
+        keep = locations.apply(lambda locs: any(loc in preferred_locations for loc in locs)).astype(bool)
+        metadata_df = metadata_df[keep]
+
+    if data.preferred_language and data.preferred_language != "Niet van toepassing":
+        for candidate_col in ("language", "taal", "preferred_language"):
+            if candidate_col in metadata_df.columns:
+                metadata_df = metadata_df[metadata_df[candidate_col] == data.preferred_language]
+                break
+
+    if data.preferred_period:
+        preferred_periods = set(data.preferred_period)
+        for candidate_col in ("period", "periode", "preferred_period"):
+            if candidate_col in metadata_df.columns:
+                metadata_df = metadata_df[metadata_df[candidate_col].isin(preferred_periods)]
+                break
+        else:
+            if "start_date" in metadata_df.columns:
+                months = pd.to_datetime(metadata_df["start_date"], errors="coerce").dt.month
+                metadata_df = metadata_df[months.map(MONTH_PERIODS).isin(preferred_periods)]
+
+    return sorted(metadata_df["id"].tolist())
+
+
+def student_variants(student: StudentInput) -> list[StudentInput]:
+    variants = [student]
+    for credit_range in ([0, 15], [15, 15], [16, 29], [30, 30]):
+        variants.append(student.model_copy(update={"wanted_study_credit_range": credit_range}))
+    for location in sorted(ALLOWED_LOCATIONS):
+        variants.append(student.model_copy(update={"location_preference": [location]}))
+    for level in ("NLQF5", "NLQF6", "NLQF8"):
+        variants.append(student.model_copy(update={"level_preference": [level]}))
+    for periods in (["P1"], ["P2", "P4"], ["P3"]):
+        variants.append(student.model_copy(update={"preferred_period": periods}))
+    for language in ("Nederlands", "Engels"):
+        variants.append(student.model_copy(update={"preferred_language": language}))
+    variants.append(student.model_copy(update={
+        "wanted_study_credit_range": [0, 15], "location_preference": ["Breda", "Tilburg"],
+        "level_preference": ["NLQF6"], "preferred_period": ["P3", "P4"], "preferred_language": "Engels",
+    }))
+    return variants
+
+
+def synthetic_catalogue_path(tmp_path) -> str:
+    # A language column and unknown or missing values, which the real CSV does not have
+    metadata, _ = make_catalogue(300, dimension=4, seed=3)
+    rng = np.random.default_rng(3)
+    metadata["language"] = rng.choice(["Nederlands", "Engels", None], size=len(metadata))
+    metadata["studycredit"] = metadata["studycredit"].astype(float)
+    metadata.loc[::17, "studycredit"] = np.nan
+    metadata.loc[::19, "level"] = None
+    metadata.loc[::23, "location"] = None
+    metadata.loc[::29, "location"] = "Breda"
+    metadata.loc[::31, "start_date"] = None
+    path = str(tmp_path / "synthetic.csv")
+    metadata.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("catalogue", ["real", "synthetic"])
+def test_filter_index_matches_the_pandas_filters(catalogue, tmp_path, student_inputs):
+    path = settings.metadata_path if catalogue == "real" else synthetic_catalogue_path(tmp_path)
+    from_csv = FilterIndex.from_csv(path)
+    from_frame = FilterIndex(pd.read_csv(path))
+
+    students = [StudentInput(**record) for record in student_inputs]
+    for data in students + student_variants(students[0]):
+        expected = pandas_candidate_ids(path, data)
+        assert sorted(from_csv.candidate_ids(data).tolist()) == expected
+        assert sorted(from_frame.candidate_ids(data).tolist()) == expected
@@ -0,0 +1,74 @@
+import os
+import sys
+import types
+
+from config import settings
+from services import description_store, prefork
+from services.model_registry import StubEncoder
+
+
+def fake_uvicorn(monkeypatch, served):
+    class Server:
+        def __init__(self, config):
+            pass
+
+        def run(self, sockets):
+            served.append(sockets)
+
+    monkeypatch.setattr(prefork.signal, "signal", lambda signum, handler: None)
+    monkeypatch.setattr(prefork.uvicorn, "Config", lambda app, lifespan: None)
+    monkeypatch.setattr(prefork.uvicorn, "Server", Server)
+
+
+def test_worker_starts_without_torch(monkeypatch):
+    served = []
+    fake_uvicorn(monkeypatch, served)
+    monkeypatch.delitem(sys.modules, "torch", raising=False)
+
+    prefork._serve_worker(app=None, sock="socket", workers=2)
+
+    assert served == [["socket"]]
+    assert "torch" not in sys.modules
+
+
+def test_worker_splits_torch_threads(monkeypatch):
+    served, threads = [], []
+    fake_uvicorn(monkeypatch, served)
+    monkeypatch.setitem(sys.modules, "torch", types.SimpleNamespace(set_num_threads=threads.append))
+    monkeypatch.setattr(prefork.os, "cpu_count", lambda: 8)
+
+    prefork._serve_worker(app=None, sock="socket", workers=4)
+
+    assert threads == [2]
+
+
+def test_preload_never_encodes_in_the_parent(monkeypatch, tmp_path):
+    # No description cache yet, as in a fresh container: a spawned process has to build it
+    cache_path = str(tmp_path / "module_description_embeddings.npy")
+    monkeypatch.setattr(settings, "description_embeddings_path", cache_path)
+    monkeypatch.setattr(description_store, "_stores", {})
+    monkeypatch.setattr(prefork.gc, "freeze", lambda: None)
+    encoded = []
+    monkeypatch.setattr(StubEncoder, "encode", lambda self, texts, **kwargs: encoded.append(texts))
+
+    prefork.preload()
+
+    assert encoded == []
+    assert os.path.exists(cache_path)
+    assert description_store.get_description_store(settings.metadata_path)._snapshot is not None
+
+
+def test_preload_reads_a_matching_description_cache(monkeypatch, tmp_path):
+    cache_path = str(tmp_path / "module_description_embeddings.npy")
+    monkeypatch.setattr(settings, "description_embeddings_path", cache_path)
+    monkeypatch.setattr(description_store, "_stores", {})
+    description_store.get_description_store(settings.metadata_path).load()
+    monkeypatch.setattr(description_store, "_stores", {})
+
+    def no_subprocess(method):
+        raise AssertionError("the cache matches, nothing to build")
+
+    monkeypatch.setattr(prefork.multiprocessing, "get_context", no_subprocess)
+    prefork.preload_descriptions()
+
+    assert description_store.get_description_store(settings.metadata_path)._snapshot is not None
@@ -0,0 +1,27 @@
+import time
+
+from config import settings
+from services import predict_service
+from services.model_registry import registry
+from models.student_input import StudentInput
+
+
+def test_batch_shares_one_rerank_budget(student_inputs, monkeypatch):
+    deadlines = []
+
+    def recording_rerank(matches, data, metadata_path, deadline):
+        deadlines.append(deadline)
+        return matches[:5]
+
+    monkeypatch.setattr(predict_service, "rerank_top_5", recording_rerank)
+    batch = [StudentInput(**raw) for raw in student_inputs[:4]]
+    vectors = registry.get(settings.encoder_model).encode(predict_service.batch_texts(batch))
+
+    started = time.perf_counter()
+    predict_service.predict_batch_from_vectors(batch, vectors)
+    budget = settings.rerank_budget_ms / 1000
+
+    assert len(deadlines) == 4
+    # The first student gets a quarter of the budget, nobody gets past the batch's deadline
+    assert deadlines[0] <= started + budget / 4 + 0.05
+    assert max(deadlines) <= started + budget + 0.05
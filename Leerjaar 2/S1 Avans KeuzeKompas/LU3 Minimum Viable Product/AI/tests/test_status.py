@@ -0,0 +1,23 @@
+from config import settings
+from controllers.status_controller import rerank_status
+from services import reranker
+from services.model_registry import registry
+
+
+def test_rerank_status_does_not_load_the_model(monkeypatch):
+    monkeypatch.setattr(settings, "rerank_model", "cross-encoder/test")
+    monkeypatch.setattr(reranker, "_reranker", None)
+
+    def load_cross_encoder(*args, **kwargs):
+        raise AssertionError("the status probe loaded the cross-encoder")
+
+    monkeypatch.setattr(registry, "load_cross_encoder", load_cross_encoder)
+    assert rerank_status() == {"loaded": False}
+
+
+def test_rerank_status_reports_a_loaded_model(monkeypatch):
+    monkeypatch.setattr(settings, "rerank_model", "cross-encoder/test")
+    monkeypatch.setattr(reranker, "_reranker", reranker.Reranker(model=None, batch_size=8))
+    status = rerank_status()
+    assert status["loaded"] is True
+    assert status["calls"] == 0
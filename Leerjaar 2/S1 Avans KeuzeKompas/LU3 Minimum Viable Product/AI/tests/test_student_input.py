@@ -0,0 +1,70 @@
+import pytest
+from pydantic import ValidationError
+
+from models.student_input import StudentInput, StudentInputColumns, validate_columns
+
+# Invalid values per field; each is applied to every fixture input on its own
+INVALID_VALUES = {
+    "current_study": ["", "   "],
+    "interests": [[], ["  "], ["programmeren", ""]],
+    "wanted_study_credit_range": [(-1, 10), (20, 10), (0, 31), (-5, -10), (25, 40),
+                                  (0, 2**70), (-2**70, 10), (2**70 + 1, 2**70), (2**63, 2**63)],
+    "location_preference": [[], ["Amsterdam"], ["Breda", "Utrecht", "Delft"]],
+    "learning_goals": [[], ["\t"]],
+    "level_preference": [[], ["NLQF9"], ["NLQF5", "HBO"]],
+    "preferred_language": ["Frans", ""],
+    "preferred_period": [[], ["P5"], ["P1", "Q2"]],
+}
+
+
+def variants(student_inputs) -> list[dict]:
+    records = [dict(record) for record in student_inputs]
+    for field, values in INVALID_VALUES.items():
+        for value in values:
+            records += [{**record, field: value} for record in student_inputs]
+    # Several fields wrong at once
+    records.append({**student_inputs[0], "current_study": "", "location_preference": ["Utrecht"], "preferred_period": []})
+    return records
+
+
+def pydantic_errors(record: dict) -> list[dict]:
+    # Field errors of the per-object validators, in the same shape as validate_columns()
+    try:
+        StudentInput(**record)
+    except ValidationError as e:
+        return [{"field": error["loc"][0], "message": error["msg"].removeprefix("Value error, ")} for error in e.errors()]
+    return []
+
+
+def test_validate_columns_matches_student_input(student_inputs):
+    records = variants(student_inputs)
+    result = validate_columns(StudentInputColumns.from_records(records))
+
+    assert len(result.valid) == len(records)
+    for row, record in enumerate(records):
+        expected = pydantic_errors(record)
+        assert bool(result.valid[row]) == (not expected), record
+        assert result.errors.get(row, []) == expected, record
+
+
+def test_fixture_inputs_are_valid(student_inputs):
+    result = validate_columns(StudentInputColumns.from_records(student_inputs))
+    assert result.valid.all()
+    assert result.errors == {}
+
+
+def test_columns_of_different_length_are_rejected(student_inputs):
+    columns = StudentInputColumns.from_records(student_inputs[:2]).model_dump()
+    columns["current_study"] = columns["current_study"][:1]
+    with pytest.raises(ValidationError):
+        StudentInputColumns(**columns)
+
+
+def test_validate_endpoint_reports_huge_credits_per_row(student_inputs):
+    from controllers.predict_controller import validate_batch
+
+    huge = {**student_inputs[0], "wanted_study_credit_range": [0, 1180591620717411303424]}
+    response = validate_batch(StudentInputColumns.from_records([student_inputs[0], huge]))
+
+    assert response["valid"] == 1
+    assert response["errors"] == [{"row": 1, "errors": pydantic_errors(huge)}]
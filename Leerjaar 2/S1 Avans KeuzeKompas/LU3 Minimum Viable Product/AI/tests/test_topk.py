@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from services.topk import top_k_indices
+
+
+def reference(scores: np.ndarray, k: int) -> np.ndarray:
+    # What the retrieval paths did before: a full stable sort, best first, ties by index
+    return np.argsort(-scores, kind="stable")[:max(k, 0)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [0, 1, 5, 17, 99, 100, 150])
+def test_top_k_matches_stable_argsort_with_ties(seed, k):
+    # Few distinct values, so nearly every k-th score is tied with others
+    scores = np.random.default_rng(seed).integers(0, 6, size=100).astype(np.float32)
+    assert top_k_indices(scores, k).tolist() == reference(scores, k).tolist()
+
+
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_top_k_matches_stable_argsort_on_distinct_scores(k):
+    scores = np.random.default_rng(7).standard_normal(1000)
+    assert top_k_indices(scores, k).tolist() == reference(scores, k).tolist()
+
+
+def test_all_tied_keeps_index_order():
+    assert top_k_indices(np.zeros(10), 4).tolist() == [0, 1, 2, 3]
+
+
+def test_negative_k_and_empty_scores_give_nothing():
+    assert top_k_indices(np.arange(5.0), -1).size == 0
+    assert top_k_indices(np.zeros(0), 5).size == 0
@@ -0,0 +1,13 @@
+from services.embedding_cache import embedding_cache
+from services.metrics import render_metrics
+from services.response_cache import response_cache
+from services.warmup import dummy_inference
+
+
+def test_dummy_inference_leaves_caches_and_metrics_alone():
+    dummy_inference()  # the first run may load the encoder and the stores
+    before = (response_cache.stats(), embedding_cache.stats(), render_metrics())
+
+    dummy_inference()
+
+    assert (response_cache.stats(), embedding_cache.stats(), render_metrics()) == before